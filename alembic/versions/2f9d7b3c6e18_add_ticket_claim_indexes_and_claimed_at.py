@@ -0,0 +1,56 @@
+"""Add ticket claim indexes and claimed_at
+
+Revision ID: 2f9d7b3c6e18
+Revises: 8e2b6d4a0c71
+Create Date: 2026-10-18 18:47:12.305518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = "2f9d7b3c6e18"
+down_revision: Union[str, None] = "8e2b6d4a0c71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The unique index cannot be created while a ticket is claimed by more than one member
+    if not context.is_offline_mode():
+        shared_tickets = (
+            op.get_bind()
+            .execute(
+                sa.text(
+                    "SELECT ticket_id FROM members WHERE ticket_id IS NOT NULL "
+                    "GROUP BY ticket_id HAVING count(*) > 1"
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if shared_tickets:
+            raise RuntimeError(
+                f"Tickets claimed by more than one member must be resolved first: {shared_tickets}"
+            )
+
+    op.add_column("members", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_members_ticket_id", "members", ["ticket_id"], unique=True)
+    op.create_index(
+        "ix_members_not_reacted",
+        "members",
+        ["id"],
+        postgresql_where=sa.text("NOT reacted"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_members_not_reacted", table_name="members")
+    op.drop_index("ix_members_ticket_id", table_name="members")
+    op.drop_column("members", "claimed_at")
@@ -0,0 +1,72 @@
+"""Add cache invalidation triggers
+
+Revision ID: 8e2b6d4a0c71
+Revises: 5c7a3e9f1d42
+Create Date: 2026-10-18 16:02:37.114906
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2b6d4a0c71"
+down_revision: Union[str, None] = "5c7a3e9f1d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notifies `table:id` for every changed row, once the transaction commits
+    op.execute(
+        """
+        CREATE FUNCTION notify_row_invalidation() RETURNS trigger AS $$
+        DECLARE
+            row_id bigint;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := OLD.id;
+            ELSE
+                row_id := NEW.id;
+            END IF;
+            PERFORM pg_notify('cache_invalidation', TG_TABLE_NAME || ':' || row_id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Notifies `table` once per statement, so bulk imports do not send a notification per row
+    op.execute(
+        """
+        CREATE FUNCTION notify_table_invalidation() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('cache_invalidation', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER members_cache_invalidation
+        AFTER INSERT OR UPDATE OR DELETE ON members
+        FOR EACH ROW EXECUTE FUNCTION notify_row_invalidation()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tickets_cache_invalidation
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tickets
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_table_invalidation()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tickets_cache_invalidation ON tickets")
+    op.execute("DROP TRIGGER members_cache_invalidation ON members")
+    op.execute("DROP FUNCTION notify_table_invalidation()")
+    op.execute("DROP FUNCTION notify_row_invalidation()")
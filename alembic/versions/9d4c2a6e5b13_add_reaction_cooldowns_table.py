@@ -0,0 +1,44 @@
+"""Add reaction cooldowns table
+
+Revision ID: 9d4c2a6e5b13
+Revises: 3b8e1f0c9a27
+Create Date: 2026-10-18 11:03:27.184590
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4c2a6e5b13"
+down_revision: Union[str, None] = "3b8e1f0c9a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cooldowns are short-lived and cheap to lose in a crash, so the table skips the WAL
+    op.create_table(
+        "reaction_cooldowns",
+        sa.Column("message_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("user_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("expires_at_ms", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("message_id", "user_id"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_reaction_cooldowns_expires_at_ms"),
+        "reaction_cooldowns",
+        ["expires_at_ms"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_reaction_cooldowns_expires_at_ms"), table_name="reaction_cooldowns")
+    op.drop_table("reaction_cooldowns")
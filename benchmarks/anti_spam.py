@@ -0,0 +1,125 @@
+"""Microbenchmark of the AntiSpamTask cooldown store.
+
+Compares the current CooldownStore with the original dict-of-dicts store, which kept a
+timezone-aware datetime per reactor and rebuilt every per-message dict on each cleanup tick.
+
+Run with:
+
+    uv run python -m benchmarks.anti_spam
+"""
+
+import math
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+from bot.cooldowns import CooldownStore
+
+SIZES = (10_000, 100_000)
+MESSAGE_IDS = (1354054425131634728, 1404183326591127614)
+# Reactor IDs are in the range of real discord snowflakes
+FIRST_USER_ID = 1_100_000_000_000_000_000
+EXPIRY_SECONDS = 300
+
+
+class LegacyStore:
+    """The cooldown store as it was before CooldownStore."""
+
+    def __init__(self, expiry_seconds: int) -> None:
+        self.recent_reactors: dict[int, dict[int, datetime]] = {}
+        self.expiry_time = timedelta(seconds=expiry_seconds)
+
+    def add(self, message_id: int, user_id: int) -> None:
+        if message_id not in self.recent_reactors:
+            self.recent_reactors[message_id] = {}
+        self.recent_reactors[message_id][user_id] = datetime.now(timezone.utc)
+
+    def is_active(self, message_id: int, user_id: int) -> bool:
+        user_times = self.recent_reactors.get(message_id, {})
+        last_reacted = user_times.get(user_id, datetime.min.replace(tzinfo=timezone.utc))
+        return (datetime.now(timezone.utc) - last_reacted) < self.expiry_time
+
+    def expire(self) -> None:
+        now = datetime.now(timezone.utc)
+        for message_id in list(self.recent_reactors.keys()):
+            self.recent_reactors[message_id] = {
+                user_id: timestamp
+                for user_id, timestamp in self.recent_reactors[message_id].items()
+                if (now - timestamp) < self.expiry_time
+            }
+            if not self.recent_reactors[message_id]:
+                del self.recent_reactors[message_id]
+
+    def expire_all(self) -> None:
+        self.expiry_time = timedelta(0)
+        self.expire()
+
+
+class CurrentStore(CooldownStore):
+    __slots__ = ()
+
+    def expire_all(self) -> None:
+        self.expire(now=math.inf)
+
+
+def timed(func: Callable[[], object]) -> float:
+    """Returns how many milliseconds a call of func took."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def reactors(size: int) -> Iterator[tuple[int, int]]:
+    """Yields freshly allocated IDs, like the ones parsed from each gateway event."""
+    for i in range(size):
+        yield MESSAGE_IDS[i % len(MESSAGE_IDS)], FIRST_USER_ID + i * 4_194_304
+
+
+def fill(store: LegacyStore | CurrentStore, size: int) -> None:
+    for message_id, user_id in reactors(size):
+        store.add(message_id, user_id)
+
+
+def lookup(store: LegacyStore | CurrentStore, size: int) -> None:
+    for message_id, user_id in reactors(size):
+        store.is_active(message_id, user_id)
+
+
+def memory(factory: Callable[[], LegacyStore | CurrentStore], size: int) -> int:
+    """Returns the bytes allocated by a store holding the given number of reactors."""
+    tracemalloc.start()
+    store = factory()
+    fill(store, size)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return allocated
+
+
+def main() -> None:
+    stores: dict[str, Callable[[], LegacyStore | CurrentStore]] = {
+        "legacy": lambda: LegacyStore(EXPIRY_SECONDS),
+        "current": lambda: CurrentStore(EXPIRY_SECONDS),
+    }
+    print(
+        f"{'store':<8} {'reactors':>9} {'record':>10} {'lookup':>10} {'idle tick':>10} "
+        f"{'full tick':>10} {'memory':>10}"
+    )
+    for size in SIZES:
+        for name, factory in stores.items():
+            store = factory()
+            record_ms = timed(lambda: fill(store, size))
+            lookup_ms = timed(lambda: lookup(store, size))
+            # A cleanup tick while nothing has expired yet, then one where everything has
+            idle_ms = timed(store.expire)
+            full_ms = timed(store.expire_all)
+            memory_mb = memory(factory, size) / 1024 / 1024
+            print(
+                f"{name:<8} {size:>9} {record_ms:>8.1f}ms {lookup_ms:>8.1f}ms "
+                f"{idle_ms:>8.3f}ms {full_ms:>8.1f}ms {memory_mb:>8.2f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import asyncio
+import signal
 
 import discord
 from discord.ext import commands
 
-from bot import config, ticket_cog, utility_cog, welcome_and_coc_cog
+from bot import config, ticket_cog, ticket_sync_cog, utility_cog, welcome_and_coc_cog
 
 
 async def main() -> None:
@@ -14,10 +15,24 @@ async def main() -> None:
 
     discord.utils.setup_logging()
     bot = commands.Bot(command_prefix="!", intents=intents)
-    await bot.add_cog(utility_cog.Utility(bot))
-    await bot.add_cog(welcome_and_coc_cog.WelcomeAndCoC(bot))
-    await bot.add_cog(ticket_cog.TicketVerification(bot))
-    await bot.start(config.DISCORD_TOKEN)
+    # Closing the bot unloads the cogs, which flush their queued writes, so stopping the
+    # container closes it like an interrupt does
+    closing: set[asyncio.Task[None]] = set()
+
+    def close() -> None:
+        task = asyncio.create_task(bot.close())
+        closing.add(task)
+        task.add_done_callback(closing.discard)
+
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, close)
+
+    async with bot:
+        await bot.add_cog(utility_cog.Utility(bot))
+        await bot.add_cog(welcome_and_coc_cog.WelcomeAndCoC(bot))
+        await bot.add_cog(ticket_cog.TicketVerification(bot))
+        if config.TICKET_EXPORT_DIR:
+            await bot.add_cog(ticket_sync_cog.TicketSync(bot))
+        await bot.start(config.DISCORD_TOKEN)
 
 
 if __name__ == "__main__":
@@ -28,17 +28,66 @@ def get_env_var_int(name: str, default: int | None = None) -> int:
         raise IncorrectConfigException(f"{name} must be an integer, got {value}")
 
 
+def get_env_var_rate(name: str, default: str | None = None) -> tuple[int, float]:
+    """Get an environment variable as a rate limit written as "<times>/<seconds>", with optional
+    default value"""
+    value = get_env_var(name, default)
+
+    try:
+        times, seconds = value.split("/")
+        rate = (int(times), float(seconds))
+    except ValueError:
+        raise IncorrectConfigException(f"{name} must be written as <times>/<seconds>, got {value}")
+    if rate[0] <= 0 or rate[1] <= 0:
+        raise IncorrectConfigException(f"{name} must be a positive rate, got {value}")
+    return rate
+
+
 DISCORD_TOKEN = get_env_var("DISCORD_TOKEN")
 DISCORD_GUILD = get_env_var("DISCORD_GUILD")
 ORGANIZER_ROLE_NAME = get_env_var("ORGANIZER_ROLE_NAME", "organizers")
 DATABASE_URL = get_env_var("DATABASE_URL")
+# Connections kept open, and the ones opened on top of them under load. The cache
+# invalidation listener holds one of them.
+DB_POOL_SIZE = get_env_var_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = get_env_var_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_RECYCLE = get_env_var_int("DB_POOL_RECYCLE", 30 * 60)  # Default to 30 minutes
+DB_STATEMENT_CACHE_SIZE = get_env_var_int("DB_STATEMENT_CACHE_SIZE", 100)
+DB_STATEMENT_TIMEOUT_MS = get_env_var_int("DB_STATEMENT_TIMEOUT_MS", 10 * 1000)
 SPAM_COOLDOWN = get_env_var_int("SPAM_COOLDOWN", 5 * 60)  # Default to 5 minutes
+# "memory" keeps cooldowns in this process, "database" shares them between replicas
+COOLDOWN_BACKEND = get_env_var("COOLDOWN_BACKEND", "memory")
+if COOLDOWN_BACKEND not in ("memory", "database"):
+    raise IncorrectConfigException(
+        f"COOLDOWN_BACKEND must be memory or database, got {COOLDOWN_BACKEND}"
+    )
+# Reaction pages fetched at the same time by the sync commands
+SYNC_CONCURRENCY = get_env_var_int("SYNC_CONCURRENCY", 4)
+# Workers handling member events and the events they can have queued before listeners wait
+EVENT_WORKERS = get_env_var_int("EVENT_WORKERS", 4)
+EVENT_QUEUE_SIZE = get_env_var_int("EVENT_QUEUE_SIZE", 1000)
+# Seconds the queued member events are given to finish when the bot shuts down
+EVENT_DRAIN_TIMEOUT = get_env_var_int("EVENT_DRAIN_TIMEOUT", 10)
+# Members whose flags are kept in memory and the seconds before they are read again
+MEMBER_CACHE_SIZE = get_env_var_int("MEMBER_CACHE_SIZE", 10000)
+MEMBER_CACHE_TTL = get_env_var_int("MEMBER_CACHE_TTL", 5 * 60)
+# Member flag updates are committed together every MEMBER_FLUSH_INTERVAL_MS milliseconds, or
+# as soon as MEMBER_FLUSH_ROWS members are waiting
+MEMBER_FLUSH_INTERVAL_MS = get_env_var_int("MEMBER_FLUSH_INTERVAL_MS", 250)
+MEMBER_FLUSH_ROWS = get_env_var_int("MEMBER_FLUSH_ROWS", 500)
 
 MEMBER_ROLE_NAME = get_env_var("MEMBER_ROLE_NAME", "members")
 COC_MESSAGE_LINK = get_env_var("COC_MESSAGE_LINK")
 COC_MESSAGE_ID = int(COC_MESSAGE_LINK.split("/")[-1])
 COC_CHANNEL_ID = int(COC_MESSAGE_LINK.split("/")[-2])
 COC_THREAD_PREFIX = get_env_var("COC_THREAD_PREFIX", "welcome")
+# "threads" welcomes every member in a private thread, "button" only has them press the
+# "Accept CoC" button posted with !postcocbutton
+ONBOARDING_MODE = get_env_var("ONBOARDING_MODE", "threads")
+if ONBOARDING_MODE not in ("threads", "button"):
+    raise IncorrectConfigException(
+        f"ONBOARDING_MODE must be threads or button, got {ONBOARDING_MODE}"
+    )
 
 TICKET_HOLDER_ROLE_NAME = get_env_var("TICKET_HOLDER_ROLE_NAME", "ticketholders")
 TICKET_MESSAGE_LINK = get_env_var("TICKET_MESSAGE_LINK")
@@ -46,6 +95,18 @@ TICKET_MESSAGE_ID = int(TICKET_MESSAGE_LINK.split("/")[-1])
 TICKET_CHANNEL_ID = int(TICKET_MESSAGE_LINK.split("/")[-2])
 TICKET_THREAD_PREFIX = get_env_var("TICKET_CHANNEL_PREFIX", "ticket-verification")
 BOT_INTERACTIONS_CHANNEL_ID = get_env_var_int("BOT_INTERACTIONS_CHANNEL_ID")
+# Directory the order exports are written to, synced every TICKET_SYNC_INTERVAL seconds.
+# Ticket sync is disabled when it is empty.
+TICKET_EXPORT_DIR = get_env_var("TICKET_EXPORT_DIR", "")
+TICKET_EXPORT_COLUMN = get_env_var("TICKET_EXPORT_COLUMN", "order_id")
+TICKET_SYNC_INTERVAL = get_env_var_int("TICKET_SYNC_INTERVAL", 60)
+
+# Rate limits written as <times>/<seconds>, per user unless stated otherwise
+TICKET_COMMAND_RATE_LIMIT = get_env_var_rate("TICKET_COMMAND_RATE_LIMIT", "3/60")
+TICKET_COMMAND_GUILD_RATE_LIMIT = get_env_var_rate("TICKET_COMMAND_GUILD_RATE_LIMIT", "30/60")
+TICKET_SUBMIT_RATE_LIMIT = get_env_var_rate("TICKET_SUBMIT_RATE_LIMIT", "5/60")
+REACTION_RATE_LIMIT = get_env_var_rate("REACTION_RATE_LIMIT", "10/60")
+COC_BUTTON_RATE_LIMIT = get_env_var_rate("COC_BUTTON_RATE_LIMIT", "5/60")
 
 ACCEPTABLE_REACTION_EMOJIS = [
     "👍",  # Thumbs up - approval
@@ -0,0 +1,176 @@
+import math
+import time
+from collections import deque
+from typing import Protocol
+
+from bot import db
+from bot.exceptions import IncorrectConfigException
+from bot.models import ReactionCooldown
+
+
+class CooldownStore:
+    """Expiring cooldowns for (message_id, user_id) pairs.
+
+    Both IDs are packed into a single integer key and every cooldown is stored as a
+    `time.monotonic()` deadline, so wall-clock jumps never shorten or extend a cooldown.
+    Deadlines are rounded up to `resolution` seconds and grouped in buckets that share a single
+    deadline object. All cooldowns last the same amount of time, so buckets are created in
+    deadline order and expiring only has to pop buckets from the front of the queue.
+    """
+
+    __slots__ = ("expiry_seconds", "resolution", "_deadlines", "_buckets")
+
+    def __init__(self, expiry_seconds: float, resolution: float = 1.0) -> None:
+        self.expiry_seconds = expiry_seconds
+        self.resolution = resolution
+        self._deadlines: dict[int, float] = {}  # {packed key: deadline}
+        self._buckets: deque[tuple[float, list[int]]] = deque()  # [(deadline, [packed key])]
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    @staticmethod
+    def pack(message_id: int, user_id: int) -> int:
+        """Packs two 64-bit discord IDs into a single integer key."""
+        return message_id << 64 | user_id
+
+    def add(self, message_id: int, user_id: int, now: float | None = None) -> float:
+        """Starts or restarts the cooldown of a user for a message. Returns its deadline."""
+        if now is None:
+            now = time.monotonic()
+        deadline = math.ceil((now + self.expiry_seconds) / self.resolution) * self.resolution
+        if not self._buckets or self._buckets[-1][0] != deadline:
+            self._buckets.append((deadline, []))
+        deadline, keys = self._buckets[-1]
+
+        key = self.pack(message_id, user_id)
+        keys.append(key)
+        self._deadlines[key] = deadline
+        return deadline
+
+    def is_active(self, message_id: int, user_id: int, now: float | None = None) -> bool:
+        """Checks if the user is on cooldown for the message, even if it was not expired yet."""
+        deadline = self._deadlines.get(self.pack(message_id, user_id))
+        return deadline is not None and (time.monotonic() if now is None else now) < deadline
+
+    def expire(self, now: float | None = None) -> int:
+        """Removes the cooldowns whose deadline has passed. Returns how many were removed."""
+        if now is None:
+            now = time.monotonic()
+        expired = 0
+        while self._buckets and self._buckets[0][0] <= now:
+            _, keys = self._buckets.popleft()
+            for key in keys:
+                # A restarted cooldown is also listed in a later bucket
+                deadline = self._deadlines.get(key)
+                if deadline is not None and deadline <= now:
+                    del self._deadlines[key]
+                    expired += 1
+        return expired
+
+
+class CooldownBackend(Protocol):
+    """Where AntiSpamTask keeps its cooldowns."""
+
+    async def is_active(self, message_id: int, user_id: int) -> bool: ...
+
+    async def add(self, message_id: int, user_id: int) -> None: ...
+
+    async def expire(self) -> int: ...
+
+    async def flush(self) -> None: ...
+
+
+class MemoryCooldownBackend:
+    """Keeps the cooldowns in the memory of this process only."""
+
+    __slots__ = ("store",)
+
+    def __init__(self, expiry_seconds: float) -> None:
+        self.store = CooldownStore(expiry_seconds)
+
+    async def is_active(self, message_id: int, user_id: int) -> bool:
+        return self.store.is_active(message_id, user_id)
+
+    async def add(self, message_id: int, user_id: int) -> None:
+        self.store.add(message_id, user_id)
+
+    async def expire(self) -> int:
+        return self.store.expire()
+
+    async def flush(self) -> None:
+        pass
+
+
+class DatabaseCooldownBackend:
+    """Shares the cooldowns through the reaction_cooldowns table, so that they survive restarts
+    and every replica of the bot sees them.
+
+    New cooldowns are kept in a local CooldownStore, which answers for this process without a
+    query, and are written to the database in batches by flush(). Cooldowns of other processes
+    are only visible once they have been flushed. Users found without a cooldown in the
+    database are remembered for `miss_seconds`, so repeated reactions cost a single query.
+    """
+
+    __slots__ = ("expiry_seconds", "batch_size", "miss_seconds", "_local", "_misses", "_pending")
+
+    def __init__(
+        self, expiry_seconds: float, batch_size: int = 500, miss_seconds: float = 5.0
+    ) -> None:
+        self.expiry_seconds = expiry_seconds
+        self.batch_size = batch_size
+        self.miss_seconds = miss_seconds
+        self._local = CooldownStore(expiry_seconds)
+        self._misses = CooldownStore(miss_seconds)
+        self._pending: dict[tuple[int, int], int] = {}  # {(message_id, user_id): expires_at_ms}
+
+    @staticmethod
+    def _now_ms() -> int:
+        return time.time_ns() // 1_000_000
+
+    async def is_active(self, message_id: int, user_id: int) -> bool:
+        if self._local.is_active(message_id, user_id):
+            return True
+        if self._misses.is_active(message_id, user_id):
+            return False
+        async with db.get_session() as session:
+            active = await ReactionCooldown.is_active(
+                message_id, user_id, self._now_ms(), session=session
+            )
+        if not active and self.miss_seconds:
+            self._misses.add(message_id, user_id)
+        return active
+
+    async def add(self, message_id: int, user_id: int) -> None:
+        self._local.add(message_id, user_id)
+        self._pending[(message_id, user_id)] = self._now_ms() + int(self.expiry_seconds * 1000)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def expire(self) -> int:
+        await self.flush()
+        self._local.expire()
+        self._misses.expire()
+        async with db.get_session() as session:
+            return await ReactionCooldown.delete_expired(self._now_ms(), session=session)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            async with db.get_session() as session:
+                await ReactionCooldown.upsert_many(pending, session=session)
+        except Exception:
+            # Keep the batch for the next flush, unless newer cooldowns replaced it meanwhile
+            self._pending = pending | self._pending
+            raise
+
+
+def create_cooldown_backend(name: str, expiry_seconds: float) -> CooldownBackend:
+    """Creates the cooldown backend with the given name, as configured by COOLDOWN_BACKEND."""
+    if name == "memory":
+        return MemoryCooldownBackend(expiry_seconds)
+    if name == "database":
+        return DatabaseCooldownBackend(expiry_seconds)
+    raise IncorrectConfigException(f"Unknown cooldown backend {name}")
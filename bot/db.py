@@ -1,20 +1,112 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncGenerator, Awaitable, Callable
 
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
 
 from bot import config
 
 logger = logging.getLogger(__name__)
 
-engine = create_async_engine(config.DATABASE_URL)
+
+class PoolStats:
+    """How long sessions waited for a connection of the pool."""
+
+    __slots__ = ("checkouts", "total_wait", "max_wait")
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """The default pool of async engines, recording how long every checkout waits, including
+    the time to open a new connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record(time.perf_counter() - start)
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """Returns the pool and driver options of the engine for a database URL.
+
+    Only PostgreSQL is pooled. SQLite, used by the tests, keeps the defaults of SQLAlchemy.
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {
+            # Prepared statements kept by every connection
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)},
+        },
+    }
+
+
+engine = create_async_engine(config.DATABASE_URL, **engine_options(config.DATABASE_URL))
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# A read-only query run with a session of every warmed up connection
+type WarmupQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def warm_up(queries: list[WarmupQuery]) -> int:
+    """Opens the connections of the pool and prepares the given queries on each of them.
+
+    The connections are held at the same time, so every connection the pool keeps is opened,
+    and every query is run once on each so its statement is compiled and prepared before the
+    first events arrive.
+
+    :param list[WarmupQuery] queries: The hot queries, run with a session of every connection.
+
+    :returns int: The number of connections warmed up.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    async with AsyncExitStack() as stack:
+        connections = await asyncio.gather(
+            *(
+                stack.enter_async_context(engine.connect())
+                for _ in range(engine.pool.size() - engine.pool.checkedout())
+            )
+        )
+        for connection in connections:
+            async with AsyncSession(bind=connection) as session:
+                for query in queries:
+                    await query(session)
+                await session.rollback()
+    return len(connections)
+
 
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -1,3 +1,6 @@
+from discord.ext import commands
+
+
 class IncorrectConfigException(Exception):
     pass
 
@@ -26,6 +29,10 @@ class TicketAlreadyClaimedException(Exception):
     pass
 
 
+class TicketClaimedByAnotherMemberException(Exception):
+    pass
+
+
 class MemberHasNotReactedToCocException(Exception):
     pass
 
@@ -40,3 +47,10 @@ class RoleAssignmentFailedException(Exception):
 
 class EmptyRoleException(Exception):
     pass
+
+
+class RateLimitedException(commands.CheckFailure):
+    def __init__(self, action: str, retry_after: float) -> None:
+        super().__init__(f"{action} is rate limited, retry after {retry_after:.2f} seconds.")
+        self.action = action
+        self.retry_after = retry_after
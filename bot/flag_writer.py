@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+from bot import config, db
+from bot.models import Member
+
+logger = logging.getLogger(__name__)
+
+# The new dm_sent and reacted flags of a member, by column name
+type Flags = dict[str, bool]
+
+
+class MemberFlagWriter:
+    """A write-behind queue for the flags of the members, committed in groups.
+
+    Updates are coalesced per member, so only the latest value of every flag is written. The
+    queued updates are flushed in a single transaction every `interval` seconds, or as soon as
+    `max_rows` members are queued, so a burst of joins and leaves costs a few commits instead
+    of one per event. Updates that fail to flush are queued again, behind any newer ones.
+    Flushes are serialized, so updates are committed in the order they were queued.
+    """
+
+    __slots__ = (
+        "interval",
+        "max_rows",
+        "flushes",
+        "flushed_rows",
+        "_pending",
+        "_flushing",
+        "_full",
+        "_lock",
+        "_task",
+    )
+
+    def __init__(self, interval: float, max_rows: int) -> None:
+        self.interval = interval
+        self.max_rows = max_rows
+        self.flushes = 0
+        self.flushed_rows = 0
+        self._pending: dict[int, Flags] = {}
+        self._flushing: dict[int, Flags] = {}
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, id: int, flags: Flags) -> None:
+        """Queues new flags for a member, replacing the queued values of the same flags."""
+        self._pending.setdefault(id, {}).update(flags)
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+
+    def pending(self, id: int) -> Flags:
+        """Returns the flags of a member that are not committed yet."""
+        return self._flushing.get(id, {}) | self._pending.get(id, {})
+
+    async def start(self) -> None:
+        """Starts flushing in the background, if it is not already."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="member-flag-writer")
+
+    async def close(self) -> None:
+        """Stops flushing in the background and flushes the updates that are still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Lost the flags of {len(self._pending)} members on shutdown: {e}")
+
+    async def flush(self) -> int:
+        """Writes the queued updates in a single transaction.
+
+        :returns int: The number of members updated.
+
+        :raises Exception: If the transaction failed. The updates stay queued.
+        """
+        async with self._lock:
+            self._full.clear()
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._flushing = batch
+            try:
+                async with db.get_session() as session:
+                    await Member.bulk_set_flags(batch, session=session)
+            except Exception:
+                for id, flags in batch.items():
+                    self._pending[id] = flags | self._pending.get(id, {})
+                raise
+            finally:
+                self._flushing = {}
+            self.flushes += 1
+            self.flushed_rows += len(batch)
+            return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing the flags of {len(self._pending)} members: {e}")
+
+
+member_flag_writer = MemberFlagWriter(
+    config.MEMBER_FLUSH_INTERVAL_MS / 1000, config.MEMBER_FLUSH_ROWS
+)
@@ -0,0 +1,103 @@
+import logging
+from typing import Iterable
+
+import discord
+from discord.utils import get as dget
+
+from bot import config
+
+logger = logging.getLogger(__name__)
+
+
+class GuildEntities:
+    __slots__ = ("roles", "channels", "missing")
+
+    def __init__(self) -> None:
+        self.roles: dict[str, discord.Role] = {}
+        self.channels: dict[int, discord.TextChannel] = {}
+        self.missing: set[str] = set()
+
+
+class GuildRegistry:
+    """The configured roles and channels of every guild, resolved ahead of their use.
+
+    `guild.roles` and `guild.text_channels` build a new sorted list on every access, so the
+    configured entities are resolved once per guild by load() and looked up from dicts
+    afterwards. discord.py updates role and channel objects in place, so the guild only has to
+    be loaded again when one of its roles or channels is created, deleted or changed. Guilds that
+    were not loaded and names that are not configured fall back to a scan.
+    """
+
+    def __init__(self, role_names: Iterable[str], channel_ids: Iterable[int]) -> None:
+        self.role_names = tuple(role_names)
+        self.channel_ids = tuple(channel_ids)
+        self._guilds: dict[int, GuildEntities] = {}
+
+    def load(self, guild: discord.Guild) -> set[str]:
+        """Resolves the configured roles and channels of a guild, logging the ones that went
+        missing since the last load and the ones that were found again.
+
+        :param discord.Guild guild: The guild to resolve the entities of.
+
+        :returns set[str]: The configured roles and channels that were not found.
+        """
+        entities = GuildEntities()
+        for role in guild.roles:
+            # Like discord.utils.get, the first role with a configured name wins
+            if role.name in self.role_names and role.name not in entities.roles:
+                entities.roles[role.name] = role
+        for channel_id in self.channel_ids:
+            channel = guild.get_channel(channel_id)
+            if isinstance(channel, discord.TextChannel):
+                entities.channels[channel_id] = channel
+
+        entities.missing = {
+            f"role '{name}'" for name in self.role_names if name not in entities.roles
+        } | {
+            f"text channel with id={channel_id}"
+            for channel_id in self.channel_ids
+            if channel_id not in entities.channels
+        }
+
+        previous = self._guilds.get(guild.id)
+        reported = previous.missing if previous else set()
+        for entity in sorted(entities.missing - reported):
+            logger.error(f"Configured {entity} not found in {guild.name}.")
+        for entity in sorted(reported - entities.missing):
+            logger.info(f"Configured {entity} found in {guild.name}.")
+
+        self._guilds[guild.id] = entities
+        return entities.missing
+
+    def forget(self, guild: discord.Guild) -> None:
+        """Drops the entities of a guild the bot is no longer in."""
+        self._guilds.pop(guild.id, None)
+
+    def role(self, guild: discord.Guild, name: str) -> discord.Role | None:
+        """Returns the role of the guild with the given name, if there is one."""
+        entities = self._guilds.get(guild.id)
+        if entities is None or name not in self.role_names:
+            return dget(guild.roles, name=name)
+        return entities.roles.get(name)
+
+    def text_channel(self, guild: discord.Guild, channel_id: int) -> discord.TextChannel | None:
+        """Returns the text channel of the guild with the given ID, if there is one."""
+        entities = self._guilds.get(guild.id)
+        if entities is None or channel_id not in self.channel_ids:
+            channel = guild.get_channel(channel_id)
+            return channel if isinstance(channel, discord.TextChannel) else None
+        return entities.channels.get(channel_id)
+
+
+guild_registry = GuildRegistry(
+    role_names=(
+        config.MEMBER_ROLE_NAME,
+        config.TICKET_HOLDER_ROLE_NAME,
+        config.ORGANIZER_ROLE_NAME,
+    ),
+    channel_ids=(
+        config.COC_CHANNEL_ID,
+        config.TICKET_CHANNEL_ID,
+        config.BOT_INTERACTIONS_CHANNEL_ID,
+    ),
+)
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot import db
+
+logger = logging.getLogger(__name__)
+
+# The channel the triggers of the invalidated tables notify
+CHANNEL = "cache_invalidation"
+
+# Called with the primary key of the row that changed, or None when any row may have changed
+type InvalidationHandler = Callable[[int | None], None]
+
+
+class LocalInvalidationBus:
+    """Tells the in-process caches which rows of a table changed.
+
+    Nothing is notified by this implementation on its own, so it is used where the database
+    cannot notify, such as SQLite in tests.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: defaultdict[str, list[InvalidationHandler]] = defaultdict(list)
+
+    def subscribe(self, table: str, handler: InvalidationHandler) -> None:
+        """Calls the handler whenever a row of the table changes."""
+        self._handlers[table].append(handler)
+
+    def notify(self, table: str, key: int | None = None) -> None:
+        """Calls the handlers of the table for a changed row, or for every row if key is None."""
+        for handler in self._handlers.get(table, ()):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Error invalidating {table} cache for key {key}: {e}")
+
+    def notify_all(self) -> None:
+        """Calls every handler for every row, when changes may have been missed."""
+        for table in list(self._handlers):
+            self.notify(table)
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class PostgresInvalidationBus(LocalInvalidationBus):
+    """Listens to the notifications of the invalidation triggers on PostgreSQL.
+
+    The triggers NOTIFY `table:key` for every changed row, or `table` for a statement that may
+    have changed any row, and the notifications are only delivered once the writing transaction
+    commits. The bus keeps one connection of the engine listening. While it is not connected
+    changes are missed, so every cache is invalidated whenever it (re)connects.
+
+    Notifications sent by the connections of this process are ignored, since the code writing
+    through them already updates or invalidates the caches itself.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, channel: str = CHANNEL, reconnect_delay: float = 5.0
+    ) -> None:
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task[None] | None = None
+        self._own_pids: set[int] = set()
+
+    async def start(self) -> None:
+        """Starts listening in the background, if it is not already."""
+        if self._task is None:
+            event.listen(self.engine.sync_engine, "checkout", self._on_checkout)
+            event.listen(self.engine.sync_engine, "close", self._on_close)
+            self._task = asyncio.create_task(self._listen(), name="invalidation-bus")
+
+    async def close(self) -> None:
+        """Stops listening."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            event.remove(self.engine.sync_engine, "checkout", self._on_checkout)
+            event.remove(self.engine.sync_engine, "close", self._on_close)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.engine.connect() as connection:
+                    raw_connection = await connection.get_raw_connection()
+                    listener = raw_connection.driver_connection
+                    assert listener is not None, "Connection was closed"
+                    lost = asyncio.Event()
+                    listener.add_termination_listener(lambda _: lost.set())
+                    await listener.add_listener(self.channel, self._on_notification)
+                    logger.info(f"Listening for cache invalidations on {self.channel}.")
+                    self.notify_all()
+                    try:
+                        await lost.wait()
+                        logger.warning("Lost the cache invalidation connection.")
+                    finally:
+                        # The connection goes back to the pool, where it must not listen
+                        if not listener.is_closed():
+                            await listener.remove_listener(self.channel, self._on_notification)
+            except Exception as e:
+                logger.error(f"Error listening for cache invalidations: {e}")
+            self.notify_all()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        if "pid" not in connection_record.info:
+            pid = dbapi_connection.driver_connection.get_server_pid()
+            connection_record.info["pid"] = pid
+            self._own_pids.add(pid)
+
+    def _on_close(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self._own_pids.discard(connection_record.info.pop("pid", None))
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        if pid in self._own_pids:
+            return
+        table, _, key = payload.partition(":")
+        self.notify(table, int(key) if key else None)
+
+
+def create_invalidation_bus(engine: AsyncEngine) -> LocalInvalidationBus:
+    """Creates the invalidation bus that fits the database of the engine."""
+    if engine.dialect.name == "postgresql":
+        return PostgresInvalidationBus(engine)
+    return LocalInvalidationBus()
+
+
+invalidation_bus = create_invalidation_bus(db.engine)
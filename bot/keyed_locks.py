@@ -0,0 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+
+class KeyedLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0  # tasks holding or waiting for the lock
+
+
+class KeyedLocks[K: Hashable]:
+    """An asyncio lock per key, so work on the same key runs one task at a time while work on
+    different keys runs concurrently.
+
+    A lock is created when a key is first held and dropped once no task holds or waits for it,
+    so memory stays proportional to the keys in use. The locks are not reentrant, so a task
+    holding a key must not hold it again.
+    """
+
+    __slots__ = ("_locks",)
+
+    def __init__(self) -> None:
+        self._locks: dict[K, KeyedLock] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def locked(self, key: K) -> bool:
+        """Checks if a task holds the lock of a key."""
+        entry = self._locks.get(key)
+        return entry is not None and entry.lock.locked()
+
+    @asynccontextmanager
+    async def hold(self, key: K) -> AsyncIterator[None]:
+        """Holds the lock of a key for the duration of the context, waiting for it if needed."""
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = KeyedLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del self._locks[key]
+
+
+# Held while the private thread of a member in a flow is looked up, created or deleted
+thread_locks: KeyedLocks[tuple[int, str]] = KeyedLocks()
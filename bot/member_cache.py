@@ -0,0 +1,136 @@
+import dataclasses
+import time
+from collections import OrderedDict
+
+from bot import config, db
+from bot.flag_writer import MemberFlagWriter, member_flag_writer
+from bot.models import Member
+from bot.states import MemberState
+
+
+class MemberCache:
+    """A bounded read-through cache of the member flags, in front of the members table.
+
+    The cache holds immutable member states with the time they expire. Entries are kept in
+    the order they were last used and the least recently used one is
+    evicted when the cache holds `max_size` members. Every entry is read again from the database
+    `ttl` seconds after it was cached, which bounds how stale it can get when the invalidation
+    bus is not available. Flags are changed in the cache right away and written to the
+    database by the flag writer, whose queued flags also apply to members read again before
+    they are flushed. Code that changes members in any other way must invalidate them.
+    """
+
+    __slots__ = ("max_size", "ttl", "writer", "hits", "misses", "evictions", "_entries")
+
+    def __init__(self, max_size: int, ttl: float, writer: MemberFlagWriter) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.writer = writer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, tuple[MemberState, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, id: int, now: float | None = None) -> MemberState | None:
+        """Returns the cached state of a member, or None if it is not cached or expired."""
+        entry = self._entries.get(id)
+        if entry is None or entry[1] <= (time.monotonic() if now is None else now):
+            if entry is not None:
+                del self._entries[id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(id)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, state: MemberState, now: float | None = None) -> MemberState:
+        """Caches the state of a member, evicting the least recently used one if it is full."""
+        expires = (time.monotonic() if now is None else now) + self.ttl
+        self._entries[state.id] = (state, expires)
+        self._entries.move_to_end(state.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return state
+
+    def put_loaded(self, state: MemberState) -> MemberState:
+        """Caches the state of a member loaded from the database, with its queued flags."""
+        pending = self.writer.pending(state.id)
+        return self.put(dataclasses.replace(state, **pending) if pending else state)
+
+    def invalidate(self, id: int | None = None) -> None:
+        """Drops the cached flags of a member, or of every member if id is None."""
+        if id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(id, None)
+
+    async def get_member(self, id: int) -> MemberState | None:
+        """Returns the state of a member, reading it from the database on a miss.
+
+        :param int id: The discord ID of the member.
+
+        :returns MemberState | None: The state of the member, or None if it is not in the
+            database.
+        """
+        state = self.get(id)
+        if state is not None:
+            return state
+        async with db.get_session() as session:
+            state = await Member.get_state(id, session=session)
+        return self.put_loaded(state) if state is not None else None
+
+    async def get_or_create_member(self, id: int) -> tuple[MemberState, bool]:
+        """Returns the state of a member, creating the member on a miss if it does not exist.
+
+        :param int id: The discord ID of the member.
+
+        :returns tuple[MemberState, bool]: The state of the member and whether it was created
+            by this call.
+        """
+        state = self.get(id)
+        if state is not None:
+            return state, False
+        async with db.get_session() as session:
+            state, created = await Member.get_or_create_state(id, session=session)
+        return self.put_loaded(state), created
+
+    def queue_flags(
+        self, id: int, *, dm_sent: bool | None = None, reacted: bool | None = None
+    ) -> None:
+        """Changes the given flags of an existing member in the cache and queues them to be
+        written to the database.
+
+        :param int id: The discord ID of the member.
+        :param bool | None dm_sent: The new dm_sent flag, if it changes.
+        :param bool | None reacted: The new reacted flag, if it changes.
+        """
+        flags = {
+            name: value
+            for name, value in (("dm_sent", dm_sent), ("reacted", reacted))
+            if value is not None
+        }
+        entry = self._entries.get(id)
+        if entry is not None:
+            # States are immutable, so the cached one is replaced, keeping its expiry
+            self._entries[id] = (dataclasses.replace(entry[0], **flags), entry[1])
+        self.writer.add(id, flags)
+
+    async def set_flags(
+        self, id: int, *, dm_sent: bool | None = None, reacted: bool | None = None
+    ) -> None:
+        """Changes the given flags of an existing member and commits them, along with every
+        other queued flag, before returning.
+
+        :param int id: The discord ID of the member.
+        :param bool | None dm_sent: The new dm_sent flag, if it changes.
+        :param bool | None reacted: The new reacted flag, if it changes.
+        """
+        self.queue_flags(id, dm_sent=dm_sent, reacted=reacted)
+        await self.writer.flush()
+
+
+member_cache = MemberCache(config.MEMBER_CACHE_SIZE, config.MEMBER_CACHE_TTL, member_flag_writer)
@@ -63,6 +63,32 @@ TICKET_MEMBER_ALREADY_CLAIMED_MESSAGE = (
     "Έχεις ήδη επικυρώσει ένα εισιτήριο! 😊\n\n---\n\nYou have already claimed a ticket! 😊\n\n"
 )
 
+COC_BUTTON_MESSAGE = (
+    "Αφού διαβάσεις τον [Κώδικα Δεοντολογίας]({link}), πάτησε το κουμπί για να τον αποδεχτείς "
+    "και να δεις όλα τα υπόλοιπα κανάλια!\n\n"
+    "---\n\n"
+    "Once you have read the [Code of Conduct]({link}), press the button to accept it "
+    "and see all the other channels! "
+)
+
+COC_ACCEPTED_MESSAGE = (
+    "Ευχαριστούμε που αποδέχτηκες τον Κώδικα Δεοντολογίας! Σε λίγο θα δεις όλα τα κανάλια. 😊\n\n"
+    "---\n\n"
+    "Thank you for accepting the Code of Conduct! You will see all the channels in a moment. 😊 "
+)
+
+COC_ALREADY_ACCEPTED_MESSAGE = (
+    "Έχεις ήδη αποδεχτεί τον Κώδικα Δεοντολογίας! 😊\n\n"
+    "---\n\n"
+    "You have already accepted the Code of Conduct! 😊 "
+)
+
+COC_ROLE_ASSIGNMENT_ERROR_MESSAGE = (
+    "Ο ρόλος μέλους δε σου δόθηκε λόγω σφάλματος. Δοκίμασε ξανά σε λίγο ή επικοινώνησε με την ομάδα της διοργάνωσης: {role}.\n\n"
+    "---\n\n"
+    "The member role was not assigned due to an error. Please try again in a while or contact the organizers: {role}. "
+)
+
 COC_NOT_ACCEPTED_MESSAGE = (
     "Δεν έχεις δεχτεί τον [Κώδικα Δεοντολογίας]({link}), "
     "παρακαλώ αντίδρασε με ένα thumbs-up (👍) στο [μήνυμα]({link}).\n\n"
@@ -89,6 +115,14 @@ TICKET_NOT_FOUND_IN_DATABASE_MESSAGE = (
     "If we made a mistake, shoot the organizers a message: {role}. "
 )
 
+TICKET_CLAIMED_BY_ANOTHER_MEMBER_MESSAGE = (
+    "Αυτό το εισιτήριο έχει ήδη επικυρωθεί από άλλο μέλος! 🤔\n"
+    "Θα επικοινωνήσει σύντομα μαζί σου η ομάδα {role} για να διαλευκάνει την υπόθεση!\n\n"
+    "---\n\n"
+    "This ticket has already been claimed by another member! 🤔\n"
+    "The {role} team will contact you soon to resolve the issue! "
+)
+
 TICKET_DB_ERROR_MESSAGE = (
     "Το εισιτήριό σου δεν επικυρώθηκε λόγω σφάλματος στη βάση δεδομένων. Επικοινώνησε με την ομάδα της διοργάνωσης: {role}.\n\n"
     "---\n\n"
@@ -114,3 +148,9 @@ TICKET_ACCEPTED_MESSAGE = (
     "Thank you for verifying your ticket {name}! You can now join the channels of the event! 😊 "
     "(the thread will self-destruct in 45 seconds ⏱️) "
 )
+
+RATE_LIMITED_MESSAGE = (
+    "Πολλές προσπάθειες σε λίγο χρόνο! Δοκίμασε ξανά σε {seconds} δευτερόλεπτα. ⏱️\n\n"
+    "---\n\n"
+    "Too many attempts in a short time! Please try again in {seconds} seconds. ⏱️ "
+)
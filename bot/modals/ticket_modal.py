@@ -4,6 +4,8 @@ import discord
 from discord import Interaction, TextStyle, ui
 
 from bot import config, exceptions, messages
+from bot.guild_registry import guild_registry
+from bot.rate_limits import interaction_check, ticket_submit_limiter
 from bot.roles import get_random_member_from_role
 from bot.services.ticket_services import claim_ticket
 from bot.validations.ticket_validation import can_claim_ticket
@@ -23,134 +25,97 @@ class TicketModal(ui.Modal, title="Verify your Ticket"):
     )
     success = False
 
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        """Called before on_submit. Drops submissions of members who submit too often."""
+        return await interaction_check(ticket_submit_limiter, interaction)
+
     async def on_submit(self, interaction: Interaction) -> None:
         """Called when the modal is submitted. Validates the entered ticket ID which claims the ticket if it is valid."""
+        # Claiming takes a transaction and a role assignment, so acknowledge the submission
+        # first to stay within the interaction deadline and answer with followups
+        await interaction.response.defer()
         ticket_id = self.input_ticket_id.value
+        self.success = False
 
-        # The view is only sent in private threads
-        assert isinstance(interaction.channel, discord.Thread), "Channel was not a thread"
-        # The view is only sent in private threads so there's always a guild involved
-        assert interaction.guild is not None, "Guild was None"
-
-        organizer_role = discord.utils.get(
-            interaction.guild.roles, name=config.ORGANIZER_ROLE_NAME
-        )
-        if not organizer_role:
-            self.success = False
-            await interaction.response.send_message(
-                messages.TICKET_GENERIC_ERROR_MESSAGE.format(role=f"@{config.ORGANIZER_ROLE_NAME}")
-            )
-            logger.error("The ticket modal could not find the organizer role.")
-            return
-        try:
-            random_organizer = get_random_member_from_role(organizer_role)
-        except exceptions.EmptyRoleException:
-            self.success = False
-            await interaction.response.send_message(
-                messages.TICKET_GENERIC_ERROR_MESSAGE.format(role=f"@{config.ORGANIZER_ROLE_NAME}")
-            )
-            logger.error("The ticket modal could not find a random organizer.")
-            return
         try:
-            member_can_claim_ticket = await can_claim_ticket(interaction.user, ticket_id)
+            can_claim_ticket(interaction.user, ticket_id)
+            # can_claim_ticket() ensures that the user is a member
+            assert isinstance(interaction.user, discord.Member), "User was not a member."
+            await claim_ticket(interaction.user, int(ticket_id))
         except exceptions.UserNotMemberException as e:
-            self.success = False
             logger.error(
                 f"Error claiming ticket for {interaction.user.name} ({interaction.user.id}): {e}"
             )
             return
         except exceptions.InvalidTicketIdException:
-            self.success = False
-            await interaction.response.send_message(
-                messages.TICKET_INVALID_ID_MESSAGE, ephemeral=True, delete_after=30
-            )
+            await self._reply(interaction, messages.TICKET_INVALID_ID_MESSAGE)
             return
         except exceptions.TicketHolderRoleAlreadyAssignedException:
-            self.success = False
-            await interaction.response.send_message(
-                messages.TICKET_MEMBER_ALREADY_CLAIMED_MESSAGE, ephemeral=True, delete_after=30
-            )
+            await self._reply(interaction, messages.TICKET_MEMBER_ALREADY_CLAIMED_MESSAGE)
             return
         except exceptions.MemberHasNotReactedToCocException:
-            self.success = False
-            await interaction.response.send_message(
-                messages.COC_NOT_ACCEPTED_MESSAGE.format(link=config.COC_MESSAGE_LINK),
-                ephemeral=True,
-                delete_after=30,
+            await self._reply(
+                interaction, messages.COC_NOT_ACCEPTED_MESSAGE.format(link=config.COC_MESSAGE_LINK)
             )
             return
         except exceptions.TicketAlreadyClaimedException:
-            self.success = False
-            await interaction.channel.add_user(random_organizer)
-            await interaction.response.send_message(
-                messages.TICKET_MEMBER_ALREADY_CLAIMED_WITH_NO_ROLE_MESSAGE.format(
-                    role=organizer_role.mention
-                )
-            )
-            return
-        except exceptions.TicketNotFoundInDatabaseException:
-            self.success = False
-            await interaction.channel.add_user(random_organizer)
-            await interaction.response.send_message(
-                messages.TICKET_NOT_FOUND_IN_DATABASE_MESSAGE.format(role=organizer_role.mention),
+            await self._escalate(
+                interaction, messages.TICKET_MEMBER_ALREADY_CLAIMED_WITH_NO_ROLE_MESSAGE
             )
             return
-        except Exception as e:
-            self.success = False
-            await interaction.response.send_message(
-                messages.TICKET_DB_ERROR_MESSAGE.format(role=organizer_role.mention)
-            )
-            logger.error(
-                f"Error claiming ticket for {interaction.user.name} ({interaction.user.id}): {e}"
-            )
+        except exceptions.TicketClaimedByAnotherMemberException:
+            await self._escalate(interaction, messages.TICKET_CLAIMED_BY_ANOTHER_MEMBER_MESSAGE)
             return
-
-        if not member_can_claim_ticket:
-            self.success = False
-            await interaction.channel.add_user(random_organizer)
-            await interaction.response.send_message(
-                messages.TICKET_GENERIC_ERROR_MESSAGE.format(role=organizer_role.mention)
-            )
-            logger.error(
-                f"Error claiming ticket for {interaction.user.name} ({interaction.user.id})"
-            )
+        except exceptions.TicketNotFoundInDatabaseException:
+            await self._escalate(interaction, messages.TICKET_NOT_FOUND_IN_DATABASE_MESSAGE)
             return
-
-        # can_claim_ticket() ensures that the user is a member
-        assert isinstance(interaction.user, discord.Member), "User was not a member."
-
-        try:
-            member_claimed_ticket = await claim_ticket(interaction.user, int(ticket_id))
         except exceptions.RoleAssignmentFailedException:
-            self.success = False
-            await interaction.channel.add_user(random_organizer)
-            await interaction.response.send_message(
-                messages.TICKET_ROLE_ASSIGNMENT_ERROR_MESSAGE.format(role=organizer_role.mention)
-            )
+            await self._escalate(interaction, messages.TICKET_ROLE_ASSIGNMENT_ERROR_MESSAGE)
             return
         except Exception as e:
-            self.success = False
-            await interaction.channel.add_user(random_organizer)
-            await interaction.response.send_message(
-                messages.TICKET_DB_ERROR_MESSAGE.format(role=organizer_role.mention)
-            )
             logger.error(
                 f"Error claiming ticket for {interaction.user.name} ({interaction.user.id}): {e}"
             )
-            return
-
-        if not member_claimed_ticket:
-            self.success = False
-            await interaction.channel.add_user(random_organizer)
-            await interaction.response.send_message(
-                messages.TICKET_GENERIC_ERROR_MESSAGE.format(role=organizer_role.mention)
-            )
-            logger.error(
-                f"Error claiming ticket for {interaction.user.name} ({interaction.user.id})"
+            await self._escalate(
+                interaction, messages.TICKET_DB_ERROR_MESSAGE, add_organizer=False
             )
             return
 
         self.success = True
-        await interaction.response.send_message(
+        await interaction.followup.send(
             messages.TICKET_ACCEPTED_MESSAGE.format(name=interaction.user.mention)
         )
+
+    async def _reply(self, interaction: Interaction, content: str) -> None:
+        """Sends an ephemeral followup that goes away after a while."""
+        message = await interaction.followup.send(content, ephemeral=True, wait=True)
+        await message.delete(delay=30)
+
+    async def _escalate(
+        self, interaction: Interaction, template: str, add_organizer: bool = True
+    ) -> None:
+        """Sends an error message mentioning the organizers, adding one of them to the thread.
+
+        The organizers are only looked up here, since a successful claim does not need them.
+        """
+        # The view is only sent in private threads so there's always a guild involved
+        assert interaction.guild is not None, "Guild was None"
+        assert isinstance(interaction.channel, discord.Thread), "Channel was not a thread"
+
+        organizer_role = guild_registry.role(interaction.guild, config.ORGANIZER_ROLE_NAME)
+        if not organizer_role:
+            logger.error("The ticket modal could not find the organizer role.")
+        else:
+            try:
+                random_organizer = get_random_member_from_role(organizer_role)
+            except exceptions.EmptyRoleException:
+                logger.error("The ticket modal could not find a random organizer.")
+            else:
+                if add_organizer:
+                    await interaction.channel.add_user(random_organizer)
+                await interaction.followup.send(template.format(role=organizer_role.mention))
+                return
+
+        await interaction.followup.send(
+            messages.TICKET_GENERIC_ERROR_MESSAGE.format(role=f"@{config.ORGANIZER_ROLE_NAME}")
+        )
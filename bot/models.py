@@ -1,11 +1,40 @@
-from typing import Self
+from array import array
+from datetime import datetime
+from itertools import batched
+from typing import Iterable, Mapping, Self
 
-from sqlalchemy import BigInteger, ForeignKey, select
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    CursorResult,
+    DateTime,
+    ForeignKey,
+    Index,
+    bindparam,
+    column,
+    delete,
+    exists,
+    false,
+    func,
+    lambda_stmt,
+    literal_column,
+    select,
+    text,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, selectinload
+
+from bot.states import MemberState, TicketState
 
 type BigInt = int
 
+# Number of member IDs written per statement by the bulk helpers
+BULK_BATCH_SIZE = 5000
+
 
 class Base(AsyncAttrs, DeclarativeBase):
     type_annotation_map = {
@@ -15,6 +44,17 @@ class Base(AsyncAttrs, DeclarativeBase):
 
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        # A ticket can only be claimed by one member
+        Index("ix_members_ticket_id", "ticket_id", unique=True),
+        # The members who have not accepted the CoC yet, a small part of the table
+        Index(
+            "ix_members_not_reacted",
+            "id",
+            postgresql_where=text("NOT reacted"),
+            sqlite_where=text("NOT reacted"),
+        ),
+    )
 
     id: Mapped[BigInt] = mapped_column(primary_key=True, autoincrement=False)
     dm_sent: Mapped[bool] = mapped_column(default=False, nullable=False)
@@ -22,39 +62,475 @@ class Member(Base):
     ticket_id: Mapped[BigInt | None] = mapped_column(
         BigInteger, ForeignKey("tickets.id"), nullable=True
     )
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Loaded only when asked for, e.g. with get_by_id(with_ticket=True)
     ticket: Mapped["Ticket | None"] = relationship(
-        "Ticket", back_populates="members", uselist=False, lazy="selectin"
+        "Ticket", back_populates="members", uselist=False, lazy="raise_on_sql"
     )
 
     @classmethod
-    async def get_by_id(cls, id: int, *, session: AsyncSession) -> Self | None:
+    async def get_by_id(
+        cls, id: int, *, session: AsyncSession, with_ticket: bool = False
+    ) -> Self | None:
         stmt = select(cls).filter(cls.id == id)
+        if with_ticket:
+            stmt = stmt.options(selectinload(cls.ticket))
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    @classmethod
+    async def get_state(cls, id: int, *, session: AsyncSession) -> MemberState | None:
+        """Reads the columns of a member, without creating an ORM object.
+
+        The statement is a lambda statement, so it is built and compiled once and every call
+        only binds the ID.
+
+        :param int id: The discord ID of the member.
+        :param AsyncSession session: The session to run the statement in.
+
+        :returns MemberState | None: The state of the member, or None if it does not exist.
+        """
+        stmt = lambda_stmt(
+            lambda: select(cls.id, cls.dm_sent, cls.reacted, cls.ticket_id).where(cls.id == id)
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        return MemberState(*row) if row is not None else None
+
+    @classmethod
+    async def get_or_create_state(
+        cls, id: int, *, session: AsyncSession
+    ) -> tuple[MemberState, bool]:
+        """Like get_or_create, but reads the columns of the member without an ORM object.
+
+        :param int id: The discord ID of the member.
+        :param AsyncSession session: The session to run the statements in.
+
+        :returns tuple[MemberState, bool]: The state of the member and whether it was created
+            by this call.
+        """
+        state = await cls.get_state(id, session=session)
+        if state is not None:
+            return state, False
+
+        insert = (
+            postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        )
+        insert_stmt = (
+            insert(cls)
+            .values(id=id)
+            .on_conflict_do_nothing(index_elements=[cls.id])
+            .returning(cls.id, cls.dm_sent, cls.reacted, cls.ticket_id)
+        )
+        new_row = (await session.execute(insert_stmt)).one_or_none()
+        if new_row is not None:
+            return MemberState(*new_row), True
+
+        # Another transaction created the member after it was selected
+        state = await cls.get_state(id, session=session)
+        assert state is not None, "Member vanished after a conflicting insert"
+        return state, False
+
     @classmethod
     async def get_or_create(cls, id: int, *, session: AsyncSession) -> tuple[Self, bool]:
+        """Atomically fetch or insert a member.
+
+        Existing members, the common case, are read with a single select. Missing ones are
+        inserted with ``ON CONFLICT DO NOTHING RETURNING`` and selected again only if another
+        transaction created them in between. Existing rows are never written, so looking up a
+        member never locks it, creates a new row version or notifies the other replicas.
+
+        :param int id: The discord ID of the member.
+        :param AsyncSession session: The session to run the statements in.
+
+        :returns tuple[Member, bool]: The member and whether it was created by this call.
+        """
         instance = await cls.get_by_id(id, session=session)
         if instance is not None:
             return instance, False
 
-        new_instance = cls(id=id)
-        session.add(new_instance)
-        await session.flush()
-        await session.refresh(new_instance)
-        return new_instance, True
+        insert = (
+            postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        )
+        insert_stmt = (
+            insert(cls)
+            .values(id=id)
+            .on_conflict_do_nothing(index_elements=[cls.id])
+            .returning(cls)
+        )
+        result = await session.execute(insert_stmt)
+        new_instance = result.scalar_one_or_none()
+        if new_instance is not None:
+            return new_instance, True
+
+        # Another transaction created the member after it was selected
+        instance = await cls.get_by_id(id, session=session)
+        assert instance is not None, "Member vanished after a conflicting insert"
+        return instance, False
+
+    @classmethod
+    async def bulk_mark_reacted(
+        cls, ids: Iterable[int], *, session: AsyncSession
+    ) -> tuple[int, int]:
+        """Set reacted=True for many members at once, creating the missing ones.
+
+        On PostgreSQL each batch is a single ``INSERT ... SELECT unnest(:ids)`` upsert that only
+        touches rows which have not reacted yet. SQLite falls back to a batched ``UPDATE``
+        followed by an ``INSERT ... ON CONFLICT DO NOTHING``.
+
+        :param Iterable[int] ids: The discord IDs of the members. Duplicates are ignored.
+        :param AsyncSession session: The session to run the statements in.
+
+        :returns tuple[int, int]: The number of members inserted and the number updated.
+        """
+        inserted = updated = 0
+        is_postgresql = session.get_bind().dialect.name == "postgresql"
+        for batch in batched(sorted(set(ids)), BULK_BATCH_SIZE):
+            if is_postgresql:
+                pg_stmt = postgresql.insert(cls).from_select(
+                    [cls.id, cls.dm_sent, cls.reacted],
+                    select(
+                        func.unnest(bindparam("ids", list(batch), postgresql.ARRAY(BigInteger))),
+                        false(),
+                        true(),
+                    ),
+                )
+                pg_stmt = pg_stmt.on_conflict_do_update(
+                    index_elements=[cls.id],
+                    set_={"reacted": True},
+                    where=cls.reacted.is_(False),
+                )
+                result = await session.scalars(
+                    pg_stmt.returning(literal_column("xmax = 0", Boolean))
+                )
+                for created in result:
+                    if created:
+                        inserted += 1
+                    else:
+                        updated += 1
+                continue
+
+            update_result = await session.scalars(
+                update(cls)
+                .where(cls.id.in_(batch), cls.reacted.is_(False))
+                .values(reacted=True)
+                .returning(cls.id)
+            )
+            updated += len(update_result.all())
+            insert_result = await session.scalars(
+                sqlite.insert(cls)
+                .values([{"id": id, "reacted": True} for id in batch])
+                .on_conflict_do_nothing(index_elements=[cls.id])
+                .returning(cls.id)
+            )
+            inserted += len(insert_result.all())
+        return inserted, updated
+
+    @classmethod
+    async def bulk_set_flags(
+        cls, flags: Mapping[int, Mapping[str, bool]], *, session: AsyncSession
+    ) -> None:
+        """Updates the flags of many existing members at once.
+
+        On PostgreSQL the members are grouped by the flags they change and every batch of a group
+        is a single ``UPDATE ... FROM (VALUES ...)``. SQLite has no aliased ``VALUES``, so it
+        falls back to an executemany ``UPDATE`` by primary key.
+
+        :param Mapping[int, Mapping[str, bool]] flags: The new dm_sent and reacted flags by
+            discord ID of the member.
+        :param AsyncSession session: The session to run the statements in.
+        """
+        if session.get_bind().dialect.name != "postgresql":
+            await session.execute(
+                update(cls), [{"id": id, **member_flags} for id, member_flags in flags.items()]
+            )
+            return
+
+        groups: dict[tuple[str, ...], list[tuple[int, ...]]] = {}
+        for id, member_flags in flags.items():
+            names = tuple(sorted(member_flags))
+            groups.setdefault(names, []).append((id, *(member_flags[name] for name in names)))
+        for names, rows in groups.items():
+            for batch in batched(rows, BULK_BATCH_SIZE):
+                new_values = values(
+                    column("id", BigInteger),
+                    *(column(name, Boolean) for name in names),
+                    name="new_flags",
+                ).data(list(batch))
+                await session.execute(
+                    update(cls)
+                    .where(cls.id == new_values.c.id)
+                    .values({name: new_values.c[name] for name in names})
+                )
+
+    @classmethod
+    async def claim_ticket(cls, id: int, ticket_id: int, *, session: AsyncSession) -> bool:
+        """Sets the ticket of a member who reacted to the CoC and has no ticket yet, if the
+        ticket exists.
+
+        Tickets claimed by another member are rejected by the unique index on
+        members.ticket_id, which also makes concurrent claims of a ticket wait for each other.
+
+        :param int id: The discord ID of the member.
+        :param int ticket_id: The ID of the ticket to claim.
+        :param AsyncSession session: The session to run the statement in.
+
+        :returns bool: True if the ticket was claimed, False if the member cannot claim it or
+            the ticket does not exist.
+
+        :raises IntegrityError: If another member has claimed the ticket.
+        """
+        stmt = (
+            update(cls)
+            .where(
+                cls.id == id,
+                cls.reacted.is_(True),
+                cls.ticket_id.is_(None),
+                exists().where(Ticket.id == ticket_id),
+            )
+            .values(ticket_id=ticket_id, claimed_at=func.now())
+            .returning(cls.id)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def release_ticket(cls, id: int, ticket_id: int, *, session: AsyncSession) -> bool:
+        """Clears the ticket of a member, if the member still holds the given ticket.
+
+        :param int id: The discord ID of the member.
+        :param int ticket_id: The ID of the ticket to release.
+        :param AsyncSession session: The session to run the statement in.
+
+        :returns bool: True if the ticket was released, False if the member did not hold it.
+        """
+        stmt = (
+            update(cls)
+            .where(cls.id == id, cls.ticket_id == ticket_id)
+            .values(ticket_id=None, claimed_at=None)
+            .returning(cls.id)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+
+class SyncCheckpoint(Base):
+    __tablename__ = "sync_checkpoints"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[BigInt] = mapped_column(nullable=False)
+
+    @classmethod
+    async def get_value(cls, key: str, *, session: AsyncSession) -> int | None:
+        stmt = select(cls.value).filter(cls.key == key)
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def set_value(cls, key: str, value: int, *, session: AsyncSession) -> None:
+        insert = (
+            postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        )
+        stmt = insert(cls).values(key=key, value=value)
+        stmt = stmt.on_conflict_do_update(index_elements=[cls.key], set_={"value": value})
+        await session.execute(stmt)
+
+    @classmethod
+    async def get_prefix(cls, prefix: str, *, session: AsyncSession) -> dict[str, int]:
+        """Returns the checkpoints whose key starts with the prefix, keyed by the rest of it."""
+        stmt = select(cls.key, cls.value).filter(cls.key.startswith(prefix, autoescape=True))
+        result = await session.execute(stmt)
+        return {key.removeprefix(prefix): value for key, value in result.all()}
+
+    @classmethod
+    async def delete_prefix(cls, prefix: str, *, session: AsyncSession) -> None:
+        await session.execute(delete(cls).filter(cls.key.startswith(prefix, autoescape=True)))
+
+
+class ReactionCooldown(Base):
+    __tablename__ = "reaction_cooldowns"
+
+    message_id: Mapped[BigInt] = mapped_column(primary_key=True, autoincrement=False)
+    user_id: Mapped[BigInt] = mapped_column(primary_key=True, autoincrement=False)
+    # Milliseconds since the epoch, so every replica compares against the same clock
+    expires_at_ms: Mapped[BigInt] = mapped_column(nullable=False, index=True)
+
+    @classmethod
+    async def is_active(
+        cls, message_id: int, user_id: int, now_ms: int, *, session: AsyncSession
+    ) -> bool:
+        stmt = select(cls.expires_at_ms).filter(
+            cls.message_id == message_id, cls.user_id == user_id, cls.expires_at_ms > now_ms
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def upsert_many(
+        cls, cooldowns: dict[tuple[int, int], int], *, session: AsyncSession
+    ) -> None:
+        """Writes many cooldowns in one batched statement.
+
+        :param dict[tuple[int, int], int] cooldowns: The expiry of each (message_id, user_id).
+        :param AsyncSession session: The session to run the statement in.
+        """
+        if not cooldowns:
+            return
+        insert = (
+            postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        )
+        stmt = insert(cls)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.message_id, cls.user_id],
+            set_={"expires_at_ms": stmt.excluded.expires_at_ms},
+        )
+        await session.execute(
+            stmt,
+            [
+                {"message_id": message_id, "user_id": user_id, "expires_at_ms": expires_at_ms}
+                for (message_id, user_id), expires_at_ms in cooldowns.items()
+            ],
+        )
+
+    @classmethod
+    async def delete_expired(cls, now_ms: int, *, session: AsyncSession) -> int:
+        result = await session.execute(delete(cls).filter(cls.expires_at_ms <= now_ms))
+        # Bulk deletes always return a cursor result, which has the number of deleted rows
+        assert isinstance(result, CursorResult), "Delete did not return a cursor result"
+        return int(result.rowcount)
+
+
+class PrivateThread(Base):
+    """The private thread the bot opened for a member in one of its flows."""
+
+    __tablename__ = "private_threads"
+
+    member_id: Mapped[BigInt] = mapped_column(primary_key=True, autoincrement=False)
+    # The thread prefix of the flow, e.g. COC_THREAD_PREFIX or TICKET_THREAD_PREFIX
+    flow: Mapped[str] = mapped_column(primary_key=True)
+    thread_id: Mapped[BigInt] = mapped_column(nullable=False)
+
+    @classmethod
+    async def get_thread_id(
+        cls, member_id: int, flow: str, *, session: AsyncSession
+    ) -> int | None:
+        stmt = lambda_stmt(
+            lambda: select(cls.thread_id).where(cls.member_id == member_id, cls.flow == flow)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def set_thread_id(
+        cls, member_id: int, flow: str, thread_id: int, *, session: AsyncSession
+    ) -> None:
+        insert = (
+            postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        )
+        stmt = insert(cls).values(member_id=member_id, flow=flow, thread_id=thread_id)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.member_id, cls.flow], set_={"thread_id": thread_id}
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def delete_thread_id(cls, member_id: int, flow: str, *, session: AsyncSession) -> None:
+        await session.execute(delete(cls).filter(cls.member_id == member_id, cls.flow == flow))
 
 
 class Ticket(Base):
     __tablename__ = "tickets"
 
     id: Mapped[BigInt] = mapped_column(primary_key=True, autoincrement=False)
+    # Loaded only when asked for, e.g. with get_by_id(with_members=True)
     members: Mapped[list[Member]] = relationship(
-        "Member", back_populates="ticket", lazy="selectin"
+        "Member", back_populates="ticket", lazy="raise_on_sql"
     )
 
     @classmethod
-    async def get_by_id(cls, id: int, *, session: AsyncSession) -> Self | None:
+    async def get_by_id(
+        cls, id: int, *, session: AsyncSession, with_members: bool = False
+    ) -> Self | None:
         stmt = select(cls).filter(cls.id == id)
+        if with_members:
+            stmt = stmt.options(selectinload(cls.members))
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
+
+    @classmethod
+    async def get_state(cls, id: int, *, session: AsyncSession) -> TicketState | None:
+        """Reads a ticket and the IDs of the members that claimed it in a single query.
+
+        :param int id: The ID of the ticket.
+        :param AsyncSession session: The session to run the statement in.
+
+        :returns TicketState | None: The state of the ticket, or None if it does not exist.
+        """
+        stmt = lambda_stmt(
+            lambda: (
+                select(cls.id, Member.id)
+                .outerjoin(Member, Member.ticket_id == cls.id)
+                .where(cls.id == id)
+                .order_by(Member.id)
+            )
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return None
+        return TicketState(id, tuple(row[1] for row in rows if row[1] is not None))
+
+    @classmethod
+    async def bulk_insert(cls, ids: Iterable[int], *, session: AsyncSession) -> tuple[int, int]:
+        """Insert many tickets at once, skipping the ones that already exist.
+
+        On PostgreSQL the IDs are streamed with a binary ``COPY`` into a temporary staging table
+        that is merged into tickets with a single ``INSERT ... SELECT DISTINCT``, so memory does
+        not grow with the number of IDs. SQLite falls back to batched multi-values inserts.
+
+        :param Iterable[int] ids: The ticket IDs. Duplicates are skipped.
+        :param AsyncSession session: The session to run the statements in.
+
+        :returns tuple[int, int]: The number of tickets inserted and the number of IDs read.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            connection = await session.connection()
+            # Imports are not bound by the statement timeout of the queries of the bot
+            await connection.execute(text("SET LOCAL statement_timeout = 0"))
+            await connection.execute(text("CREATE TEMPORARY TABLE tickets_staging (id bigint)"))
+            raw_connection = await connection.get_raw_connection()
+            asyncpg_connection = raw_connection.driver_connection
+            assert asyncpg_connection is not None, "Connection was closed"
+            await asyncpg_connection.copy_records_to_table(
+                "tickets_staging", records=((id,) for id in ids), columns=["id"]
+            )
+            read = (
+                await connection.execute(text("SELECT count(*) FROM tickets_staging"))
+            ).scalar_one()
+            result = await connection.execute(
+                text(
+                    "INSERT INTO tickets (id) SELECT DISTINCT id FROM tickets_staging "
+                    "ON CONFLICT (id) DO NOTHING"
+                )
+            )
+            await connection.execute(text("DROP TABLE tickets_staging"))
+            return result.rowcount, read
+
+        inserted = read = 0
+        for batch in batched(ids, BULK_BATCH_SIZE):
+            read += len(batch)
+            insert_result = await session.scalars(
+                sqlite.insert(cls)
+                .values([{"id": id} for id in set(batch)])
+                .on_conflict_do_nothing(index_elements=[cls.id])
+                .returning(cls.id)
+            )
+            inserted += len(insert_result.all())
+        return inserted, read
+
+    @classmethod
+    async def get_ids(cls, *, session: AsyncSession) -> array[int]:
+        """Returns every ticket ID in ascending order, as a compact array of 64-bit integers."""
+        ids = array("q")
+        result = await session.stream_scalars(select(cls.id).order_by(cls.id))
+        async for partition in result.partitions(BULK_BATCH_SIZE):
+            ids.extend(partition)
+        return ids
@@ -0,0 +1,174 @@
+import functools
+import logging
+import time
+from collections import OrderedDict
+from enum import StrEnum
+from typing import Any, Callable, Coroutine, Protocol
+
+import discord
+from discord.ext import commands
+
+from bot import config, messages
+from bot.exceptions import RateLimitedException
+
+logger = logging.getLogger(__name__)
+
+
+class Scope(StrEnum):
+    """What a rate limiter keeps a separate bucket for."""
+
+    USER = "user"
+    GUILD = "guild"
+    MEMBER = "member"  # a user within a guild
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """Token buckets for a single action, holding `rate` tokens that refill over `per` seconds.
+
+    Buckets are kept in the order they were last used. A bucket that has not been used for
+    `per` seconds is full again and behaves exactly like a missing one, so those are dropped
+    from the front on every hit and memory stays proportional to the recently active keys.
+    """
+
+    __slots__ = ("action", "rate", "per", "scope", "_buckets")
+
+    def __init__(self, action: str, rate: int, per: float, scope: Scope = Scope.USER) -> None:
+        self.action = action
+        self.rate = rate
+        self.per = per
+        self.scope = scope
+        self._buckets: OrderedDict[int, TokenBucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def key(self, guild_id: int | None, user_id: int) -> int:
+        """Returns the bucket key of a user in a guild according to the scope."""
+        if self.scope is Scope.USER:
+            return user_id
+        if self.scope is Scope.GUILD:
+            return guild_id or 0
+        return (guild_id or 0) << 64 | user_id
+
+    def retry_after(self, guild_id: int | None, user_id: int, now: float | None = None) -> float:
+        """Returns the seconds until the user can act in the guild, without taking a token."""
+        tokens = self._tokens(
+            self.key(guild_id, user_id), time.monotonic() if now is None else now
+        )
+        return 0.0 if tokens >= 1 else (1 - tokens) * self.per / self.rate
+
+    def hit(self, guild_id: int | None, user_id: int, now: float | None = None) -> float:
+        """Takes a token for the user in the guild.
+
+        :param int | None guild_id: The ID of the guild the action happens in, if any.
+        :param int user_id: The ID of the user performing the action.
+        :param float | None now: The current `time.monotonic()` time.
+
+        :returns float: 0 if the action is allowed, otherwise the seconds until it will be.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._prune(now)
+
+        key = self.key(guild_id, user_id)
+        tokens = self._tokens(key, now)
+        if tokens < 1:
+            return (1 - tokens) * self.per / self.rate
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = TokenBucket(tokens - 1, now)
+            return 0.0
+        bucket.tokens = tokens - 1
+        bucket.updated = now
+        self._buckets.move_to_end(key)
+        return 0.0
+
+    def _tokens(self, key: int, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.rate
+        return min(self.rate, bucket.tokens + (now - bucket.updated) * self.rate / self.per)
+
+    def _prune(self, now: float) -> None:
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket.updated < self.per:
+                break
+            self._buckets.popitem(last=False)
+
+
+ticket_command_limiter = RateLimiter("ticket command", *config.TICKET_COMMAND_RATE_LIMIT)
+ticket_command_guild_limiter = RateLimiter(
+    "ticket command", *config.TICKET_COMMAND_GUILD_RATE_LIMIT, scope=Scope.GUILD
+)
+ticket_submit_limiter = RateLimiter("ticket submit", *config.TICKET_SUBMIT_RATE_LIMIT)
+reaction_limiter = RateLimiter("reaction", *config.REACTION_RATE_LIMIT)
+coc_button_limiter = RateLimiter("CoC button", *config.COC_BUTTON_RATE_LIMIT)
+
+
+def command_check[T](*limiters: RateLimiter) -> Callable[[T], T]:
+    """A command check that raises RateLimitedException when the author is rate limited by any
+    of the limiters. Tokens are only taken when every limiter allows the command."""
+
+    def predicate(ctx: commands.Context[Any]) -> bool:
+        guild_id = ctx.guild.id if ctx.guild else None
+        for limiter in limiters:
+            retry_after = limiter.retry_after(guild_id, ctx.author.id)
+            if retry_after:
+                raise RateLimitedException(limiter.action, retry_after)
+        for limiter in limiters:
+            limiter.hit(guild_id, ctx.author.id)
+        return True
+
+    return commands.check(predicate)
+
+
+class MemberListener(Protocol):
+    """A cog listener, which discord.py calls with the member of the event as a keyword."""
+
+    async def __call__(self, *args: Any, member: discord.Member, **kwargs: Any) -> None: ...
+
+
+def listener_check(
+    limiter: RateLimiter,
+) -> Callable[[Callable[..., Coroutine[Any, Any, None]]], MemberListener]:
+    """Decorates a cog listener that takes a member argument, so that events of a rate limited
+    member are dropped before the listener runs."""
+
+    def decorator(listener: Callable[..., Coroutine[Any, Any, None]]) -> MemberListener:
+        @functools.wraps(listener)
+        async def wrapper(*args: Any, member: discord.Member, **kwargs: Any) -> None:
+            if limiter.hit(member.guild.id, member.id):
+                logger.info(f"Dropped {limiter.action} of {member.name} ({member.id}).")
+                return
+            await listener(*args, member=member, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def interaction_check(limiter: RateLimiter, interaction: discord.Interaction) -> bool:
+    """Checks an interaction of a view or modal, telling the user to slow down when it is rate
+    limited. Returns whether the interaction should be handled."""
+    retry_after = limiter.hit(interaction.guild_id, interaction.user.id)
+    if not retry_after:
+        return True
+    await interaction.response.send_message(
+        messages.RATE_LIMITED_MESSAGE.format(seconds=round(retry_after) or 1),
+        ephemeral=True,
+        delete_after=30,
+    )
+    logger.info(
+        f"Rate limited {limiter.action} of {interaction.user.name} ({interaction.user.id})."
+    )
+    return False
@@ -0,0 +1,35 @@
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from bot.config import ACCEPTABLE_REACTION_EMOJIS, COC_MESSAGE_ID, TICKET_MESSAGE_ID
+from bot.exceptions import IncorrectConfigException
+
+type ReactionRoute = tuple[int, Iterable[str], str]
+type ReactionRoutes = Mapping[int, Mapping[str, str]]
+
+# (message_id, emojis, event_name) for every reaction-driven flow. The event is dispatched
+# with the reacting member as its only argument.
+DEFAULT_REACTION_ROUTES: tuple[ReactionRoute, ...] = (
+    (COC_MESSAGE_ID, ACCEPTABLE_REACTION_EMOJIS, "member_reacted_to_coc"),
+    (TICKET_MESSAGE_ID, ACCEPTABLE_REACTION_EMOJIS, "member_reacted_to_ticket"),
+)
+
+
+def build_reaction_routes(routes: Iterable[ReactionRoute]) -> ReactionRoutes:
+    """Builds a read-only {message_id: {emoji: event_name}} routing table.
+
+    :param Iterable[ReactionRoute] routes: The (message_id, emojis, event_name) of each flow.
+
+    :returns ReactionRoutes: The routing table, so that a reaction is routed with two dict lookups.
+    """
+    table: dict[int, dict[str, str]] = {}
+    for message_id, emojis, event_name in routes:
+        message_routes = table.setdefault(message_id, {})
+        for emoji in emojis:
+            if message_routes.setdefault(emoji, event_name) != event_name:
+                raise IncorrectConfigException(
+                    f"Reaction {emoji} on message {message_id} is routed twice."
+                )
+    return MappingProxyType(
+        {message_id: MappingProxyType(emojis) for message_id, emojis in table.items()}
+    )
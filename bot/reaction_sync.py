@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Iterable
+
+import discord
+
+from bot import config, db
+from bot.member_cache import member_cache
+from bot.models import Member, SyncCheckpoint
+
+logger = logging.getLogger(__name__)
+
+# Discord returns at most 100 users per page of reaction users
+PAGE_SIZE = 100
+# Minimum number of seconds between two progress reports
+PROGRESS_INTERVAL = 5.0
+
+type ProgressCallback = Callable[[int, int, int], Awaitable[None]]
+
+
+def checkpoint_prefix(message: discord.Message) -> str:
+    """Returns the prefix of the checkpoint keys used when syncing the reactions of a message."""
+    return f"reactions:{message.channel.id}:{message.id}:"
+
+
+async def sync_reactions(
+    message: discord.Message,
+    emojis: Iterable[str],
+    *,
+    concurrency: int = config.SYNC_CONCURRENCY,
+    on_progress: ProgressCallback | None = None,
+) -> tuple[int, int]:
+    """Marks every user who reacted to a message with one of the given emojis as reacted.
+
+    The user lists of the reactions are paginated concurrently, at most `concurrency` pages at
+    a time, while discord.py's HTTP client paces the requests using the rate-limit headers.
+    User IDs are deduplicated across emojis before they are written, and the pagination cursor
+    of each emoji is checkpointed in the same transaction as its page, so an interrupted sync
+    resumes where it stopped the next time it runs.
+
+    :param discord.Message message: The message whose reactions are synced.
+    :param Iterable[str] emojis: The emojis to sync; any other reaction is ignored.
+    :param int concurrency: The maximum number of reaction pages fetched at the same time.
+    :param ProgressCallback on_progress: Awaited with the number of unique users, inserted and
+        updated members at most every PROGRESS_INTERVAL seconds and once more at the end.
+
+    :returns tuple[int, int]: The number of members inserted and the number updated.
+    """
+    prefix = checkpoint_prefix(message)
+    accepted = frozenset(emojis)
+    reactions = [reaction for reaction in message.reactions if reaction.emoji in accepted]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    seen: set[int] = set()
+    inserted = updated = 0
+    last_report = time.monotonic()
+
+    async def report(force: bool = False) -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        if on_progress is None or (not force and now - last_report < PROGRESS_INTERVAL):
+            return
+        last_report = now
+        try:
+            await on_progress(len(seen), inserted, updated)
+        except discord.HTTPException as e:
+            # The report is only a status update, so it must not stop the sync
+            logger.warning(f"Error reporting the progress of the reactions sync: {e}")
+
+    async def sync_reaction(reaction: discord.Reaction) -> None:
+        nonlocal inserted, updated
+        key = f"{prefix}{reaction.emoji}"
+        async with db.get_session() as session:
+            cursor = await SyncCheckpoint.get_value(key, session=session)
+        if cursor is not None:
+            logger.info(f"Resuming sync of {reaction.emoji} reactions after user {cursor}.")
+
+        while True:
+            after = discord.Object(id=cursor) if cursor is not None else None
+            async with semaphore:
+                page = [user async for user in reaction.users(limit=PAGE_SIZE, after=after)]
+            if not page:
+                break
+
+            # Reaction users are sorted by ID, so the largest one is the next cursor
+            cursor = max(user.id for user in page)
+            new_ids = {user.id for user in page if not user.bot} - seen
+            seen.update(new_ids)
+            async with db.get_session() as session:
+                page_inserted, page_updated = await Member.bulk_mark_reacted(
+                    new_ids, session=session
+                )
+                await SyncCheckpoint.set_value(key, cursor, session=session)
+            for member_id in new_ids:
+                member_cache.invalidate(member_id)
+            inserted += page_inserted
+            updated += page_updated
+            await report()
+
+            if len(page) < PAGE_SIZE:
+                break
+
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            for reaction in reactions:
+                task_group.create_task(sync_reaction(reaction))
+    except* discord.HTTPException as group:
+        for error in group.exceptions:
+            logger.error(
+                f"Error syncing the reactions of message {message.id}: {error}", exc_info=error
+            )
+        # The checkpoints keep the progress of every reaction, so a rerun resumes from there
+        raise group.exceptions[0]
+
+    # Every reaction was synced to the end, so the next sync starts over
+    async with db.get_session() as session:
+        await SyncCheckpoint.delete_prefix(prefix, session=session)
+    await report(force=True)
+    return inserted, updated
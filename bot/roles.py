@@ -2,9 +2,9 @@ import logging
 from random import choice
 
 import discord
-from discord.utils import get as dget
 
 from bot.exceptions import EmptyRoleException
+from bot.guild_registry import guild_registry
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +19,7 @@ async def assign_role(member: discord.Member, role_name: str) -> bool:
     """
 
     # Assign the "role_name" role
-    guild = member.guild
-    role = dget(guild.roles, name=role_name)
+    role = guild_registry.role(member.guild, role_name)
     if not role:
         logger.warning(f"Role '{role_name}' not found in the server.")
         return False
@@ -49,8 +48,8 @@ def member_has_role(member: discord.Member, role_name: str) -> bool:
 
     :returns bool: True if the member has the role, False otherwise.
     """
-    role = dget(member.roles, name=role_name)
-    return role is not None
+    role = guild_registry.role(member.guild, role_name)
+    return role is not None and member.get_role(role.id) is not None
 
 
 def get_random_member_from_role(role: discord.Role) -> discord.Member:
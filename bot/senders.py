@@ -3,19 +3,61 @@ import logging
 import discord
 from discord.utils import get as dget
 
+from bot import db
+from bot.guild_registry import guild_registry
+from bot.keyed_locks import thread_locks
+from bot.models import PrivateThread
 from bot.sanitizers import sanitize_user_name
 from bot.views.base_view import BaseView
 
 logger = logging.getLogger(__name__)
 
 
+async def get_private_thread(
+    channel: discord.TextChannel, thread_prefix: str, member: discord.Member
+) -> discord.Thread | None:
+    """Finds the private thread of a member by the thread ID stored for its flow.
+
+    The thread is looked up in the guild cache, which only holds active threads, and fetched
+    once if it is not there, so archived threads are found without paginating the channel.
+
+    :param discord.TextChannel channel: The channel containing the thread.
+    :param str thread_prefix: The prefix for the thread name, which identifies the flow.
+    :param discord.Member member: The member for which the thread was created.
+
+    :returns discord.Thread | None: The thread, or None if the member has no thread.
+    """
+    async with db.get_session() as session:
+        thread_id = await PrivateThread.get_thread_id(member.id, thread_prefix, session=session)
+
+    if thread_id is None:
+        # Threads created before their IDs were stored can only be found by name while active
+        member_name = sanitize_user_name(member.name, member.id)
+        return dget(channel.threads, name=f"{thread_prefix}-{member_name}")
+
+    thread = channel.guild.get_thread(thread_id)
+    if thread is not None:
+        return thread
+    try:
+        fetched = await channel.guild.fetch_channel(thread_id)
+    except (discord.NotFound, discord.Forbidden) as e:
+        # A thread the bot can no longer see is replaced like a deleted one
+        logger.info(
+            f"Thread with id={thread_id} of {member.name} ({member.id}) is not available: {e}"
+        )
+        async with db.get_session() as session:
+            await PrivateThread.delete_thread_id(member.id, thread_prefix, session=session)
+        return None
+    return fetched if isinstance(fetched, discord.Thread) else None
+
+
 async def send_private_message_in_thread(
     channel_id: int,
     thread_prefix: str,
     member: discord.Member,
     content: str,
     reason: str,
-    view: BaseView | None = None,
+    view: discord.ui.View | None = None,
 ) -> None:
     """Creates a private thread, adds the member to it and sends a message inside it.
 
@@ -24,42 +66,55 @@ async def send_private_message_in_thread(
     :param discord.Member member: The member to send the message to.
     :param str content: The content of the message.
     :param str reason: The reason for creating the thread and sending the message.
-    :param BaseView view: The view of the message.
+    :param discord.ui.View view: The view of the message.
 
     :returns None:
     """
 
-    guild = member.guild
-    channel = dget(guild.text_channels, id=channel_id)
+    channel = guild_registry.text_channel(member.guild, channel_id)
     if not channel:
         logger.error(f"Channel with id={channel_id} not found in the server.")
         return
 
-    member_name = sanitize_user_name(member.name, member.id)
-
-    thread = dget(channel.threads, name=f"{thread_prefix}-{member_name}")
-    if not thread:
-        thread = await channel.create_thread(
-            name=f"{thread_prefix}-{member_name}",
-            reason=reason,
-            type=discord.ChannelType.private_thread,
-            auto_archive_duration=60,  # Archive after 60 minutes of inactivity
-            invitable=False,
+    # Concurrent events of the same member would otherwise both miss the thread and create one
+    async with thread_locks.hold((member.id, thread_prefix)):
+        thread = await get_private_thread(channel, thread_prefix, member)
+        if thread and thread.locked:
+            # Only moderators can unarchive a locked thread, so the member gets a new one
+            logger.info(f"Thread with id={thread.id} of {member.name} ({member.id}) is locked.")
+            thread = None
+        if not thread:
+            member_name = sanitize_user_name(member.name, member.id)
+            thread = await channel.create_thread(
+                name=f"{thread_prefix}-{member_name}",
+                reason=reason,
+                type=discord.ChannelType.private_thread,
+                auto_archive_duration=60,  # Archive after 60 minutes of inactivity
+                invitable=False,
+            )
+            if not thread:
+                logger.error(f"Failed to create thread for {member.name} ({member.id}).")
+                return
+            async with db.get_session() as session:
+                await PrivateThread.set_thread_id(
+                    member.id, thread_prefix, thread.id, session=session
+                )
+        elif thread.archived:
+            # Threads fetched by their stored ID are usually archived, which rejects new members
+            await thread.edit(archived=False)
+
+        if member not in thread.members:
+            await thread.add_user(member)
+
+        if isinstance(view, BaseView):
+            view.message = await thread.send(view=view, content=content)
+        elif view:
+            await thread.send(view=view, content=content)
+        else:
+            await thread.send(content=content)
+        logger.info(
+            f"Sent private message{' with view' if view else ''} in thread for {member.name} ({member.id}) because {reason}."
         )
-    if not thread:
-        logger.error(f"Failed to create thread for {member.name} ({member.id}).")
-        return
-
-    if member not in thread.members:
-        await thread.add_user(member)
-
-    if view:
-        view.message = await thread.send(view=view, content=content)
-    else:
-        await thread.send(content=content)
-    logger.info(
-        f"Sent private message{' with view' if view else ''} in thread for {member.name} ({member.id}) because {reason}."
-    )
 
 
 async def delete_private_thread(
@@ -75,17 +130,23 @@ async def delete_private_thread(
     :returns None:
     """
 
-    guild = member.guild
-    channel = dget(guild.text_channels, id=channel_id)
+    channel = guild_registry.text_channel(member.guild, channel_id)
     if not channel:
         logger.error(f"Channel with id={channel_id} not found in the server.")
         return
 
-    member_name = sanitize_user_name(member.name, member.id)
-    thread = dget(channel.threads, name=f"{thread_prefix}-{member_name}")
-    if not thread:
-        logger.info(f"Thread with name={thread_prefix}-{member_name} not found in {channel.name}.")
-        return
-
-    await thread.delete(reason=reason)
-    logger.info(f"Deleted private thread for {member.name} ({member.id}) because {reason}.")
+    async with thread_locks.hold((member.id, thread_prefix)):
+        thread = await get_private_thread(channel, thread_prefix, member)
+        if not thread:
+            logger.info(
+                f"No {thread_prefix} thread of {member.name} ({member.id}) found in {channel.name}."
+            )
+            return
+
+        try:
+            await thread.delete(reason=reason)
+        except discord.NotFound:
+            logger.info(f"Thread with id={thread.id} of {member.name} ({member.id}) was deleted.")
+        async with db.get_session() as session:
+            await PrivateThread.delete_thread_id(member.id, thread_prefix, session=session)
+        logger.info(f"Deleted private thread for {member.name} ({member.id}) because {reason}.")
@@ -1,36 +1,69 @@
 import logging
 
 import discord
+from sqlalchemy.exc import IntegrityError
 
-from bot import db
+from bot import db, exceptions
 from bot.config import TICKET_HOLDER_ROLE_NAME
-from bot.exceptions import RoleAssignmentFailedException
+from bot.member_cache import member_cache
 from bot.models import Member
 from bot.roles import assign_role
+from bot.ticket_index import ticket_index
 
 logger = logging.getLogger(__name__)
 
 
-async def claim_ticket(member: discord.Member, ticket_id: int) -> bool:
+async def claim_ticket(member: discord.Member, ticket_id: int) -> None:
     """
-    Claims a ticket for a member.
+    Claims a ticket for a member, then assigns the ticket holder role.
+
+    The member is updated with one conditional UPDATE and the unique index on members.ticket_id
+    rejects a ticket that another member claimed, so two claims of a ticket can never both
+    succeed. IDs that are not in the ticket index are rejected before the transaction starts.
+    The claim is committed before the role is assigned, so no database lock or connection is
+    held while waiting on discord, and it is released again if the role cannot be assigned.
+    The member is only read again to tell why a claim failed.
 
     :discord.Member member: The discord member attempting to claim a ticket.
     :int ticket_id: The ticket ID to be claimed.
 
-    :returns bool: True if the ticket was successfully claimed, False otherwise.
+    :raises MemberHasNotReactedToCocException: If the member has not reacted to the coc message.
+    :raises TicketAlreadyClaimedException: If the member has already claimed a ticket.
+    :raises TicketClaimedByAnotherMemberException: If another member has claimed the ticket.
+    :raises TicketNotFoundInDatabaseException: If the ticket does not exist.
+    :raises RoleAssignmentFailedException: If the ticket holder role could not be assigned.
     """
+    if not await ticket_index.contains(ticket_id):
+        raise exceptions.TicketNotFoundInDatabaseException("Ticket not found in the database.")
+
+    async with db.get_session() as session:
+        try:
+            claimed = await Member.claim_ticket(member.id, ticket_id, session=session)
+        except IntegrityError:
+            raise exceptions.TicketClaimedByAnotherMemberException(
+                "Ticket has already been claimed by another member."
+            ) from None
+        if not claimed:
+            db_member = await Member.get_state(member.id, session=session)
+            if db_member is None or not db_member.reacted:
+                raise exceptions.MemberHasNotReactedToCocException(
+                    "Member has not reacted to the coc message."
+                )
+            if db_member.ticket_id is not None:
+                raise exceptions.TicketAlreadyClaimedException(
+                    "Member has already claimed a ticket."
+                )
+            raise exceptions.TicketNotFoundInDatabaseException("Ticket not found in the database.")
+
+    # The claim is committed, so the cached ticket of the member is stale
+    member_cache.invalidate(member.id)
+
     if not await assign_role(member, TICKET_HOLDER_ROLE_NAME):
-        raise RoleAssignmentFailedException(
+        async with db.get_session() as session:
+            await Member.release_ticket(member.id, ticket_id, session=session)
+        member_cache.invalidate(member.id)
+        raise exceptions.RoleAssignmentFailedException(
             f"Failed to assign {TICKET_HOLDER_ROLE_NAME} role to {member.name} ({member.id})."
         )
 
-    async with db.get_session() as session:
-        db_member, _ = await Member.get_or_create(member.id, session=session)
-        db_member.ticket_id = ticket_id
-        try:
-            session.add(db_member)
-        except Exception as e:
-            logger.error(f"Error updating ticket_id for {member.name} ({member.id}): {e}")
-            return False
-    return True
+    logger.info(f"Member {member.name} ({member.id}) claimed ticket {ticket_id}.")
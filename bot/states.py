@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class MemberState:
+    """The columns of a member at the time they were read.
+
+    States are plain values that are not attached to any session, so they can be cached and
+    passed between sessions. Members are changed by ID through the update functions instead.
+    """
+
+    id: int
+    dm_sent: bool
+    reacted: bool
+    ticket_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class TicketState:
+    """A ticket and the members that claimed it, at the time they were read."""
+
+    id: int
+    member_ids: tuple[int, ...]
@@ -1,12 +1,24 @@
 import logging
+from typing import Any
 
 import discord
 from discord.ext import commands
 
 from bot import config, messages
+from bot.exceptions import RateLimitedException
+from bot.guild_registry import guild_registry
+from bot.invalidation import invalidation_bus
+from bot.rate_limits import (
+    command_check,
+    listener_check,
+    reaction_limiter,
+    ticket_command_guild_limiter,
+    ticket_command_limiter,
+)
 from bot.roles import member_has_role
 from bot.senders import delete_private_thread, send_private_message_in_thread
-from bot.views.ticket_view import TicketView
+from bot.ticket_index import ticket_index
+from bot.views.ticket_view import ClaimTicketButton, TicketView
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +30,17 @@ class TicketVerification(commands.Cog):
         """Called when the cog is initialized."""
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        """Registers the claim button, so the buttons of every ticket thread are handled, and
+        loads the ticket index."""
+        self.bot.add_dynamic_items(ClaimTicketButton)
+        invalidation_bus.subscribe("tickets", ticket_index.invalidate)
+        try:
+            await ticket_index.load()
+        except Exception as e:
+            # Until it is loaded, every ticket ID is looked up in the database
+            logger.error(f"Error loading the ticket index: {e}")
+
     @commands.Cog.listener()
     async def on_new_member_reacted_to_coc(self, member: discord.Member) -> None:
         """Called when a new member reacts to the code of conduct message."""
@@ -30,10 +53,11 @@ class TicketVerification(commands.Cog):
             member,
             messages.NEW_MEMBER_TICKET_MESSAGE.format(name=member.mention),
             f"private {config.TICKET_THREAD_PREFIX} thread",
-            view=TicketView(member),
+            view=TicketView(member.id),
         )
 
     @commands.Cog.listener()
+    @listener_check(reaction_limiter)
     async def on_member_reacted_to_ticket(self, member: discord.Member) -> None:
         """Called when a member reacts to the ticket message."""
 
@@ -52,7 +76,7 @@ class TicketVerification(commands.Cog):
             member,
             messages.ASK_FOR_TICKET_MESSAGE.format(name=member.mention),
             f"private {config.TICKET_THREAD_PREFIX} thread",
-            view=TicketView(member),
+            view=TicketView(member.id),
         )
 
     @commands.Cog.listener()
@@ -66,8 +90,30 @@ class TicketVerification(commands.Cog):
             "member left the server",
         )
 
+    async def cog_command_error(self, ctx: commands.Context[Any], error: Exception) -> None:
+        """Called when a command of this cog raises an error."""
+        if isinstance(error, RateLimitedException):
+            await ctx.reply(
+                messages.RATE_LIMITED_MESSAGE.format(seconds=round(error.retry_after) or 1),
+                ephemeral=True,
+                delete_after=30,
+            )
+            logger.info(f"Rate limited {error.action} of {ctx.author.name} ({ctx.author.id}).")
+            return
+        logger.error(f"Error in command {ctx.command}: {error}", exc_info=error)
+        try:
+            await ctx.reply(
+                messages.TICKET_GENERIC_ERROR_MESSAGE.format(
+                    role=f"@{config.ORGANIZER_ROLE_NAME}"
+                ),
+                ephemeral=True,
+            )
+        except discord.HTTPException as e:
+            logger.error(f"Failed to report the error to {ctx.author.name} ({ctx.author.id}): {e}")
+
     @commands.hybrid_command()
     @commands.guild_only()
+    @command_check(ticket_command_limiter, ticket_command_guild_limiter)
     async def ticket(self, ctx: commands.Context[commands.Bot]) -> None:
         """Claim tickets by typing !ticket to start a thread. | Επικύρωσε το εισιτήριό σου γράφοντας !ticket για να ξεκινήσεις ένα νήμα.
 
@@ -110,8 +156,10 @@ class TicketVerification(commands.Cog):
             return
 
         if ctx.channel.id != config.BOT_INTERACTIONS_CHANNEL_ID:
-            bot_channel = self.bot.get_channel(config.BOT_INTERACTIONS_CHANNEL_ID)
-            if not (bot_channel and isinstance(bot_channel, discord.TextChannel)):
+            bot_channel = guild_registry.text_channel(
+                ctx.guild, config.BOT_INTERACTIONS_CHANNEL_ID
+            )
+            if bot_channel is None:
                 logger.error("Could not find the bot interactions channel.")
                 return
 
@@ -136,5 +184,5 @@ class TicketVerification(commands.Cog):
             ctx.author,
             messages.ASK_FOR_TICKET_MESSAGE.format(name=ctx.author.mention),
             f"private {config.TICKET_THREAD_PREFIX} thread",
-            view=TicketView(ctx.author),
+            view=TicketView(ctx.author.id),
         )
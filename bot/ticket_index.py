@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_left
+
+from bot import db
+from bot.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+
+class TicketIndex:
+    """The IDs of every ticket in the database, kept in memory to reject unknown IDs without a
+    query.
+
+    The IDs are stored in a sorted `array('q')`, 8 bytes per ticket, and looked up with a binary
+    search. Tickets imported by another process are not in the index until it is loaded again,
+    so a miss reloads it, at most once every `refresh_interval` seconds. Until the index is
+    loaded every ID is considered known.
+    """
+
+    __slots__ = ("refresh_interval", "_ids", "_loaded_at", "_lock")
+
+    def __init__(self, refresh_interval: float = 60.0) -> None:
+        self.refresh_interval = refresh_interval
+        self._ids: array[int] | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids) if self._ids is not None else 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._ids is not None
+
+    async def load(self) -> None:
+        """Loads every ticket ID from the database, replacing the current ones."""
+        async with db.get_session() as session:
+            ids = await Ticket.get_ids(session=session)
+        self._ids = ids
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(ids)} ticket IDs.")
+
+    def invalidate(self, ticket_id: int | None = None) -> None:
+        """Lets the next miss reload the index right away, since tickets were added."""
+        self._loaded_at = 0.0
+
+    async def contains(self, ticket_id: int) -> bool:
+        """Checks if a ticket might exist. False means that it certainly does not.
+
+        :param int ticket_id: The ID of the ticket.
+
+        :returns bool: False if the ticket is not in the database, True if it may be.
+        """
+        if self._ids is None or self._search(self._ids, ticket_id):
+            return True
+        async with self._lock:
+            # Another miss may have reloaded the index while this one waited
+            if time.monotonic() - self._loaded_at >= self.refresh_interval:
+                await self.load()
+        return self._search(self._ids, ticket_id)
+
+    @staticmethod
+    def _search(ids: array[int], ticket_id: int) -> bool:
+        i = bisect_left(ids, ticket_id)
+        return i < len(ids) and ids[i] == ticket_id
+
+
+ticket_index = TicketIndex()
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import logging
+import time
+from pathlib import Path
+
+from bot import db
+from bot.models import SyncCheckpoint, Ticket
+from bot.tickets import DEFAULT_COLUMN, TicketIdReader
+
+logger = logging.getLogger(__name__)
+
+EXPORT_SUFFIXES = (".csv", ".jsonl", ".ndjson", ".json")
+# Seconds after its last change a file is considered completely written
+SETTLE_SECONDS = 30.0
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def checkpoint_prefix(path: Path) -> str:
+    """Returns the prefix of the checkpoint keys that track an export file."""
+    return f"tickets:{path.name}:"
+
+
+def file_digest(path: Path, length: int) -> int:
+    """Hashes the first `length` bytes of a file into a signed 64-bit integer, so it fits in a
+    checkpoint."""
+    digest = hashlib.blake2b(digest_size=8)
+    with path.open("rb") as file:
+        while length > 0:
+            chunk = file.read(min(HASH_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            digest.update(chunk)
+            length -= len(chunk)
+    return int.from_bytes(digest.digest(), "big", signed=True)
+
+
+async def sync_ticket_export(
+    path: Path, column: str = DEFAULT_COLUMN
+) -> tuple[int, int, int] | None:
+    """Imports the rows of an export file that were added since it was last synced.
+
+    A file is fingerprinted by its size, modification time and a hash of the bytes that were
+    already imported. Files whose size and modification time did not change are skipped without
+    being read. When the imported part of a file is unchanged, only the rows after the stored
+    watermark are read. Otherwise the file was rewritten and is imported again as a whole, which
+    is safe because existing tickets are skipped. The new tickets and the fingerprint are written
+    in the same transaction.
+
+    :param Path path: The export file.
+    :param str column: The column or key holding the order ID.
+
+    :returns tuple[int, int, int] | None: The number of tickets inserted, duplicate and invalid
+        IDs, or None if the file did not change.
+    """
+    prefix = checkpoint_prefix(path)
+    stat = path.stat()
+    async with db.get_session() as session:
+        state = await SyncCheckpoint.get_prefix(prefix, session=session)
+    if state.get("size") == stat.st_size and state.get("mtime_ns") == stat.st_mtime_ns:
+        return None
+
+    offset = state.get("offset", 0)
+    if offset and (
+        offset > stat.st_size
+        or await asyncio.to_thread(file_digest, path, offset) != state.get("digest")
+    ):
+        logger.info(f"Ticket export {path.name} was rewritten, importing it again.")
+        offset = 0
+
+    # The last line of a file that is still being written may be incomplete
+    settled = time.time() - stat.st_mtime > SETTLE_SECONDS
+    reader = TicketIdReader(path, column, offset=offset, complete_lines_only=not settled)
+
+    async with db.get_session() as session:
+        # The IDs are streamed into the database, so memory does not grow with the delta
+        inserted, read = await Ticket.bulk_insert(reader, session=session)
+        digest = await asyncio.to_thread(file_digest, path, reader.offset)
+        fingerprint = {
+            # A file that is not settled yet is checked again even if it does not change, so
+            # that its last line is imported once it is
+            "size": stat.st_size if settled else -1,
+            "mtime_ns": stat.st_mtime_ns,
+            "offset": reader.offset,
+            "digest": digest,
+        }
+        for key, value in fingerprint.items():
+            await SyncCheckpoint.set_value(prefix + key, value, session=session)
+    return inserted, read - inserted, reader.invalid
+
+
+async def sync_ticket_exports(
+    directory: Path, column: str = DEFAULT_COLUMN
+) -> tuple[int, int, int]:
+    """Imports the new rows of every export file in a directory.
+
+    :param Path directory: The directory the order exports are written to.
+    :param str column: The column or key holding the order ID.
+
+    :returns tuple[int, int, int]: The number of tickets inserted, duplicate and invalid IDs.
+    """
+    inserted = duplicates = invalid = 0
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() not in EXPORT_SUFFIXES or not path.is_file():
+            continue
+        try:
+            result = await sync_ticket_export(path, column)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error syncing ticket export {path.name}: {e}")
+            continue
+        if result is None:
+            continue
+        inserted += result[0]
+        duplicates += result[1]
+        invalid += result[2]
+        logger.info(
+            f"Synced ticket export {path.name}. Inserted: {result[0]}, "
+            f"Duplicates: {result[1]}, Invalid: {result[2]}"
+        )
+    return inserted, duplicates, invalid
@@ -0,0 +1,45 @@
+import logging
+from pathlib import Path
+
+from discord.ext import commands, tasks
+
+from bot import config
+from bot.ticket_index import ticket_index
+from bot.ticket_sync import sync_ticket_exports
+
+logger = logging.getLogger(__name__)
+
+
+class TicketSync(commands.Cog):
+    """Imports the tickets sold since the last sync from the order export directory."""
+
+    def __init__(self, bot: commands.Bot, export_dir: str = config.TICKET_EXPORT_DIR) -> None:
+        """Called when the cog is initialized."""
+        self.bot = bot
+        self.export_dir = Path(export_dir)
+        self.sync_loop.change_interval(seconds=config.TICKET_SYNC_INTERVAL)
+
+    async def cog_load(self) -> None:
+        """Called when the cog is loaded."""
+        self.sync_loop.start()
+
+    async def cog_unload(self) -> None:
+        """Called when the cog is removed, including when the bot closes."""
+        self.sync_loop.cancel()
+
+    @tasks.loop(seconds=60)
+    async def sync_loop(self) -> None:
+        try:
+            inserted, duplicates, invalid = await sync_ticket_exports(
+                self.export_dir, config.TICKET_EXPORT_COLUMN
+            )
+            if inserted:
+                await ticket_index.load()
+        except Exception as e:
+            logger.error(f"Error syncing ticket exports from {self.export_dir}: {e}")
+            return
+        if inserted or invalid:
+            logger.info(
+                f"Synced ticket exports. Inserted: {inserted}, Duplicates: {duplicates}, "
+                f"Invalid: {invalid}"
+            )
@@ -0,0 +1,143 @@
+"""Loads the order IDs of the conference ticket exports into the tickets table.
+
+Usage:
+
+    python -m bot.tickets import <file> [--column order_id]
+
+CSV and JSON Lines exports are streamed row by row. A JSON export holding a single array is
+parsed as a whole, so prefer CSV or JSON Lines for large exports.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Any, Iterator
+
+from bot import db
+from bot.models import Ticket
+from bot.sanitizers import sanitize_ticket_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLUMN = "order_id"
+
+
+class TicketIdReader:
+    """Streams the valid ticket IDs of an order export, counting the invalid ones.
+
+    CSV and JSON Lines exports can be read from a byte `offset`, which is moved past every line
+    that is read. With `complete_lines_only` a last line without a newline is left unread,
+    since the export may still be written to.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        column: str = DEFAULT_COLUMN,
+        offset: int = 0,
+        complete_lines_only: bool = False,
+    ) -> None:
+        self.path = path
+        self.column = column
+        self.offset = offset
+        self.complete_lines_only = complete_lines_only
+        self.invalid = 0
+
+    def __iter__(self) -> Iterator[int]:
+        for value in self._values():
+            ticket_id = sanitize_ticket_id(str(value).strip())
+            if not ticket_id:
+                self.invalid += 1
+                continue
+            yield int(ticket_id)
+
+    def _lines(self) -> Iterator[str]:
+        with self.path.open("rb") as file:
+            file.seek(self.offset)
+            for line in file:
+                if self.complete_lines_only and not line.endswith(b"\n"):
+                    return
+                self.offset += len(line)
+                yield line.decode("utf-8-sig")
+
+    def _values(self) -> Iterator[Any]:
+        suffix = self.path.suffix.lower()
+        if suffix == ".csv":
+            header = None
+            if self.offset:
+                # Resuming past the header, which is still needed to find the column
+                with self.path.open(newline="", encoding="utf-8-sig") as file:
+                    header = next(csv.reader(file), None)
+            reader = csv.DictReader(self._lines(), fieldnames=header)
+            if reader.fieldnames is None:
+                return
+            if self.column not in reader.fieldnames:
+                raise ValueError(f"{self.path} has no {self.column} column")
+            for row in reader:
+                yield row[self.column]
+        elif suffix in (".jsonl", ".ndjson"):
+            for line in self._lines():
+                if line.strip():
+                    yield self._value(json.loads(line))
+        elif suffix == ".json":
+            # A JSON array can only be read as a whole
+            content = self.path.read_bytes()
+            self.offset = len(content)
+            records = json.loads(content)
+            if not isinstance(records, list):
+                raise ValueError(f"{self.path} does not hold a JSON array")
+            for record in records:
+                yield self._value(record)
+        else:
+            raise ValueError(f"Unsupported order export format {suffix}")
+
+    def _value(self, record: Any) -> Any:
+        # Exports hold either plain order IDs or one object per order
+        return record.get(self.column, "") if isinstance(record, dict) else record
+
+
+async def import_tickets(path: Path, column: str = DEFAULT_COLUMN) -> tuple[int, int, int]:
+    """Imports the order IDs of an export file into the tickets table in one transaction.
+
+    :param Path path: The CSV, JSON Lines or JSON export file.
+    :param str column: The column or key holding the order ID.
+
+    :returns tuple[int, int, int]: The number of tickets inserted, the number of duplicate IDs
+        (repeated in the file or already in the database) and the number of invalid IDs.
+    """
+    reader = TicketIdReader(path, column)
+    async with db.get_session() as session:
+        inserted, read = await Ticket.bulk_insert(reader, session=session)
+    return inserted, read - inserted, reader.invalid
+
+
+async def run_import(path: Path, column: str) -> tuple[int, int, int]:
+    try:
+        return await import_tickets(path, column)
+    finally:
+        await db.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bot.tickets", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Import an order export file")
+    import_parser.add_argument("file", type=Path, help="CSV, JSON Lines or JSON order export")
+    import_parser.add_argument(
+        "--column", default=DEFAULT_COLUMN, help="The column or key holding the order ID"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        inserted, duplicates, invalid = asyncio.run(run_import(args.file, args.column))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"Inserted: {inserted}, Duplicates: {duplicates}, Invalid: {invalid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,140 @@
 import datetime
 import logging
+from typing import Iterable
 
 import discord
 from discord.ext import commands
 from sqlalchemy import select
+from sqlalchemy.pool import QueuePool
 
 from bot import db
-from bot.config import (
-    ACCEPTABLE_REACTION_EMOJIS,
-    COC_MESSAGE_ID,
-    ORGANIZER_ROLE_NAME,
-    TICKET_MESSAGE_ID,
-)
+from bot.config import COC_THREAD_PREFIX, ORGANIZER_ROLE_NAME
+from bot.flag_writer import member_flag_writer
+from bot.guild_registry import guild_registry
+from bot.invalidation import invalidation_bus
+from bot.member_cache import member_cache
+from bot.models import Member, PrivateThread, ReactionCooldown, Ticket
+from bot.rate_limits import reaction_limiter
+from bot.reaction_routes import DEFAULT_REACTION_ROUTES, ReactionRoute, build_reaction_routes
 from bot.utility_tasks import AntiSpamTask
+from bot.work_queue import event_queue
 
 logger = logging.getLogger(__name__)
 
+# The lookups of the member events, prepared on every pooled connection at startup
+HOT_QUERIES: list[db.WarmupQuery] = [
+    lambda session: Member.get_state(0, session=session),
+    lambda session: Ticket.get_state(0, session=session),
+    lambda session: PrivateThread.get_thread_id(0, COC_THREAD_PREFIX, session=session),
+    lambda session: ReactionCooldown.is_active(0, 0, 0, session=session),
+]
+
 
 class Utility(commands.Cog):
-    def __init__(self, bot: commands.Bot) -> None:
+    def __init__(
+        self, bot: commands.Bot, reaction_routes: Iterable[ReactionRoute] = DEFAULT_REACTION_ROUTES
+    ) -> None:
         """Called when the bot is initialized."""
         self.bot = bot
+        self.reaction_routes = build_reaction_routes(reaction_routes)
         self.start_time = datetime.datetime.now(datetime.timezone.utc)
         self.anti_spam_task = AntiSpamTask(bot)
 
+    async def cog_load(self) -> None:
+        """Starts listening for changes to the cached tables."""
+        await invalidation_bus.start()
+
+    async def cog_unload(self) -> None:
+        """Called when the cog is removed, including when the bot closes."""
+        await self.anti_spam_task.close()
+        await invalidation_bus.close()
+
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """Called when the bot is ready."""
         logger.info("PyGreece bot is now logged in")
+        # Resolve the configured roles and channels now, so misconfiguration shows up at startup
+        for guild in self.bot.guilds:
+            guild_registry.load(guild)
+        # Open the pool connections and prepare the lookups of the member events on each
+        try:
+            connections = await db.warm_up(HOT_QUERIES)
+            logger.info(f"Warmed up {connections} database connections.")
+        except Exception as e:
+            logger.error(f"Error warming up the database connections: {e}")
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """Called when the bot joins a guild."""
+        guild_registry.load(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Called when the bot leaves a guild."""
+        guild_registry.forget(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        """Keeps the configured roles current."""
+        guild_registry.load(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """Keeps the configured roles current."""
+        guild_registry.load(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        """Keeps the configured roles current. Only a rename changes which role a name means."""
+        if before.name != after.name:
+            guild_registry.load(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        """Keeps the configured channels current."""
+        guild_registry.load(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        """Keeps the configured channels current."""
+        guild_registry.load(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        """Keeps the configured channels current, e.g. after one of them is renamed."""
+        if after.id in guild_registry.channel_ids:
+            guild_registry.load(after.guild)
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
         """Handles members' reactions to messages."""
 
-        logger.info("Event on_raw_reaction_add triggered.")
+        # Most reactions are on messages no flow cares about, so drop them before anything else
+        message_routes = self.reaction_routes.get(payload.message_id)
+        if message_routes is None:
+            return
+        event_name = message_routes.get(payload.emoji.name or "")
+        if event_name is None:
+            logger.info("The reaction emoji is not in the acceptable list.")
+            return
 
         if not payload.member or payload.member.bot:
             logger.info("Member not found or it is a bot.")
             return
-        if self.anti_spam_task.is_on_cooldown(payload.message_id, payload.user_id):
-            logger.info("User is on cooldown.")
+        # A member out of reaction tokens would be dropped by the listener anyway, so the burst
+        # is shed before the cooldown check, which can query the database
+        if reaction_limiter.retry_after(payload.guild_id, payload.user_id):
+            logger.info("User is rate limited.")
             return
-        if payload.emoji.name not in ACCEPTABLE_REACTION_EMOJIS:
-            logger.info("The reaction emoji is not in the acceptable list.")
-            return
-
-        if payload.message_id == COC_MESSAGE_ID:
-            self.bot.dispatch("member_reacted_to_coc", member=payload.member)
-        elif payload.message_id == TICKET_MESSAGE_ID:
-            self.bot.dispatch("member_reacted_to_ticket", member=payload.member)
-        else:
-            logger.info(f"Reaction on message {payload.message_id} not handled by this cog.")
+        if await self.anti_spam_task.is_on_cooldown(payload.message_id, payload.user_id):
+            logger.info("User is on cooldown.")
             return
 
-        self.anti_spam_task.record_reactor(payload.message_id, payload.user_id)
+        logger.info(f"Dispatching {event_name} for reaction on message {payload.message_id}.")
+        self.bot.dispatch(event_name, member=payload.member)
+        await self.anti_spam_task.record_reactor(payload.message_id, payload.user_id)
 
     @commands.command()
     @commands.guild_only()
@@ -92,6 +173,41 @@ class Utility(commands.Cog):
         except Exception as e:
             embed.add_field(name="Database Connection", value=f"❌ Error: {str(e)}", inline=False)
 
+        # Connection pool
+        if isinstance(db.engine.pool, QueuePool):
+            embed.add_field(
+                name="Database Pool",
+                value=f"{db.engine.pool.status()}\n"
+                f"Checkouts: {db.pool_stats.checkouts}, "
+                f"average wait: {db.pool_stats.average_wait * 1000:.1f}ms, "
+                f"max wait: {db.pool_stats.max_wait * 1000:.1f}ms",
+                inline=False,
+            )
+
+        # Member event queue
+        embed.add_field(
+            name="Event Queue",
+            value=f"Queued: {event_queue.depth} (peak {event_queue.max_depth}), "
+            f"running: {event_queue.in_flight}, processed: {event_queue.processed}, "
+            f"failed: {event_queue.failed}",
+            inline=False,
+        )
+
+        # Member cache
+        embed.add_field(
+            name="Member Cache",
+            value=f"Cached: {len(member_cache)}/{member_cache.max_size}, "
+            f"hits: {member_cache.hits}, misses: {member_cache.misses}, "
+            f"evictions: {member_cache.evictions}",
+            inline=False,
+        )
+        embed.add_field(
+            name="Member Flag Writer",
+            value=f"Queued: {len(member_flag_writer)}, flushes: {member_flag_writer.flushes}, "
+            f"rows flushed: {member_flag_writer.flushed_rows}",
+            inline=False,
+        )
+
         # Uptime
         uptime = datetime.datetime.now(datetime.timezone.utc) - self.start_time
         days, remainder = divmod(int(uptime.total_seconds()), 86400)
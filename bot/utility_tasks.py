@@ -1,51 +1,54 @@
 import logging
-from datetime import datetime, timedelta, timezone
 
 from discord.ext import commands, tasks
 
-from bot.config import SPAM_COOLDOWN
+from bot.config import COOLDOWN_BACKEND, SPAM_COOLDOWN
+from bot.cooldowns import create_cooldown_backend
 
 logger = logging.getLogger(__name__)
 
 
 class AntiSpamTask:
-    def __init__(self, bot: commands.Bot, expiry_seconds: int = SPAM_COOLDOWN) -> None:
+    def __init__(
+        self,
+        bot: commands.Bot,
+        expiry_seconds: int = SPAM_COOLDOWN,
+        backend: str = COOLDOWN_BACKEND,
+    ) -> None:
         self.bot = bot
-        self.recent_reactors: dict[
-            int, dict[int, datetime]
-        ] = {}  # {message_id: {user_id: timestamp}}
-        self.expiry_time = timedelta(seconds=expiry_seconds)
+        self.cooldowns = create_cooldown_backend(backend, expiry_seconds)
         self.cleanup_loop.start()
+        self.flush_loop.start()
 
-    def record_reactor(self, message_id: int, user_id: int) -> None:
-        """Record a reaction timestamp for a specific message and user."""
-        if message_id not in self.recent_reactors:
-            self.recent_reactors[message_id] = {}
-        self.recent_reactors[message_id][user_id] = datetime.now(timezone.utc)
-        logger.info(
-            f"Recorded reactor for message {message_id}, user {user_id} at {self.recent_reactors[message_id][user_id]}"
-        )
+    async def record_reactor(self, message_id: int, user_id: int) -> None:
+        """Record a reaction for a specific message and user, starting their cooldown."""
+        await self.cooldowns.add(message_id, user_id)
+        logger.info(f"Recorded reactor for message {message_id}, user {user_id}")
 
-    def is_on_cooldown(self, message_id: int, user_id: int) -> bool:
+    async def is_on_cooldown(self, message_id: int, user_id: int) -> bool:
         """Check if the user is still on cooldown for a specific message."""
-        user_times = self.recent_reactors.get(message_id, {})
-        # If it's been 5 minutes since the last reaction, consider it expired
-        # even if the user is still in the dictionary
-        last_reacted = user_times.get(user_id, datetime.min.replace(tzinfo=timezone.utc))
-        return (datetime.now(timezone.utc) - last_reacted) < self.expiry_time
+        return await self.cooldowns.is_active(message_id, user_id)
+
+    async def close(self) -> None:
+        """Stop the loops and write any cooldowns that were not flushed yet."""
+        self.cleanup_loop.cancel()
+        self.flush_loop.cancel()
+        await self.cooldowns.flush()
 
     @tasks.loop(seconds=60)
     async def cleanup_loop(self) -> None:
-        now = datetime.now(timezone.utc)
-        for message_id in list(self.recent_reactors.keys()):
-            self.recent_reactors[message_id] = {
-                user_id: timestamp
-                for user_id, timestamp in self.recent_reactors[message_id].items()
-                if (now - timestamp) < self.expiry_time
-            }
-            # Remove the message_id dict if no users are left
-            if not self.recent_reactors[message_id]:
-                del self.recent_reactors[message_id]
+        try:
+            expired = await self.cooldowns.expire()
+            logger.debug(f"Expired {expired} reaction cooldowns.")
+        except Exception as e:
+            logger.error(f"Error expiring reaction cooldowns: {e}")
+
+    @tasks.loop(seconds=5)
+    async def flush_loop(self) -> None:
+        try:
+            await self.cooldowns.flush()
+        except Exception as e:
+            logger.error(f"Error flushing reaction cooldowns: {e}")
 
     # Uncomment to run the cleanup loop on cog load
     # a prerequisite if fetching data from the discord api in the task
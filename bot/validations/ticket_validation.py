@@ -2,16 +2,16 @@ import logging
 
 import discord
 
-from bot import config, db, exceptions
-from bot.models import Member, Ticket
+from bot import config, exceptions
 from bot.roles import member_has_role
 
 logger = logging.getLogger(__name__)
 
 
-async def can_claim_ticket(member: discord.Member | discord.User, ticket_id: str) -> bool:
+def can_claim_ticket(member: discord.Member | discord.User, ticket_id: str) -> bool:
     """
-    Checks if a member can claim a ticket.
+    Checks if a member can claim a ticket, before anything is read from the database.
+    The checks that need the database run in the same transaction as the claim itself.
 
     :discord.Member member: The discord member attempting to claim a ticket.
     :str ticket_id: The ticket ID to be claimed as a string, since it is user provided input.
@@ -27,17 +27,4 @@ async def can_claim_ticket(member: discord.Member | discord.User, ticket_id: str
         raise exceptions.TicketHolderRoleAlreadyAssignedException(
             "Member already has the ticket holder role."
         )
-
-    async with db.get_session() as session:
-        db_member, _ = await Member.get_or_create(member.id, session=session)
-        if not db_member.reacted:
-            raise exceptions.MemberHasNotReactedToCocException(
-                "Member has not reacted to the coc message."
-            )
-        if db_member.ticket:
-            raise exceptions.TicketAlreadyClaimedException("Member has already claimed a ticket.")
-
-        db_ticket = await Ticket.get_by_id(int(ticket_id), session=session)
-        if not db_ticket:
-            raise exceptions.TicketNotFoundInDatabaseException("Ticket not found in the database.")
     return True
@@ -0,0 +1,60 @@
+import logging
+
+import discord
+from discord.ext import commands
+
+from bot import config, messages
+from bot.rate_limits import coc_button_limiter, interaction_check
+from bot.roles import assign_role, member_has_role
+
+logger = logging.getLogger(__name__)
+
+
+class CocView(discord.ui.View):
+    """The "Accept CoC" button of the button onboarding mode.
+
+    The view keeps no per-member state, so the single instance registered with bot.add_view
+    handles the button for every member and keeps working after a restart.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        super().__init__(timeout=None)
+        self.bot = bot
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Drops clicks of a member who presses the button too often."""
+        return await interaction_check(coc_button_limiter, interaction)
+
+    @discord.ui.button(
+        label="Αποδέχομαι | Accept CoC",
+        style=discord.ButtonStyle.success,
+        custom_id="accept_coc",
+        emoji="✅",
+    )
+    async def accept_callback(
+        self, interaction: discord.Interaction, button: discord.ui.Button["CocView"]
+    ) -> None:
+        member = interaction.user
+        # The button is only posted in the CoC channel, so the user is always a member
+        assert isinstance(member, discord.Member), "User was not a member."
+
+        if member_has_role(member, config.MEMBER_ROLE_NAME):
+            await interaction.response.send_message(
+                messages.COC_ALREADY_ACCEPTED_MESSAGE, ephemeral=True
+            )
+            return
+
+        # Assigning the role can take a while, so the member is told the outcome once it is done
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        if not await assign_role(member, config.MEMBER_ROLE_NAME):
+            await interaction.followup.send(
+                messages.COC_ROLE_ASSIGNMENT_ERROR_MESSAGE.format(
+                    role=f"@{config.ORGANIZER_ROLE_NAME}"
+                ),
+                ephemeral=True,
+            )
+            return
+
+        await interaction.followup.send(messages.COC_ACCEPTED_MESSAGE, ephemeral=True)
+        logger.info(f"Member {member.name} ({member.id}) accepted the CoC with the button.")
+        self.bot.dispatch("member_accepted_coc_with_button", member=member)
@@ -1,47 +1,105 @@
+import asyncio
 import logging
+import re
+from typing import Self
 
 import discord
 
 from bot import config
 from bot.modals.ticket_modal import TicketModal
 from bot.senders import delete_private_thread
-from bot.views.base_view import BaseView
 
 logger = logging.getLogger(__name__)
 
+# Seconds a member has to submit the ticket modal before the button can be used again
+MODAL_TIMEOUT = 15 * 60
+# Seconds the thread stays open after the ticket was claimed
+CLAIMED_THREAD_LIFETIME = 45
 
-class TicketView(BaseView):
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        self.timeout = None
-
-    @discord.ui.button(
-        label="Επικύρωσε το εισιτήριό σου! | Claim your ticket!",
-        style=discord.ButtonStyle.blurple,
-        custom_id="claim_ticket",
-        emoji="🎟️",
-    )
-    async def button_callback(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ) -> None:
-        modal = TicketModal(title="Επικύρωση Εισιτηρίου | Ticket Verification")
+
+class ClaimTicketButton(
+    discord.ui.DynamicItem[discord.ui.Button[discord.ui.View]],
+    template=r"claim_ticket(?::(?P<member_id>[0-9]+))?",
+):
+    """The claim button of a ticket thread, with the ID of its member in the custom ID.
+
+    The class is registered once with bot.add_dynamic_items and discord.py rebuilds the button
+    from the custom ID on every click, so no state is kept per thread and buttons keep working
+    after a restart. Buttons sent before the member ID was added have the plain "claim_ticket"
+    custom ID and are claimed for the member who clicks them, like they used to be.
+    """
+
+    def __init__(self, member_id: int) -> None:
+        super().__init__(
+            discord.ui.Button(
+                label="Επικύρωσε το εισιτήριό σου! | Claim your ticket!",
+                style=discord.ButtonStyle.blurple,
+                custom_id=f"claim_ticket:{member_id}",
+                emoji="🎟️",
+            )
+        )
+        self.member_id = member_id
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Item[discord.ui.View],
+        match: re.Match[str],
+    ) -> Self:
+        member_id = match["member_id"]
+        return cls(int(member_id) if member_id else interaction.user.id)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only the member the thread was opened for can claim a ticket with the button."""
+        if interaction.user.id != self.member_id:
+            await interaction.response.send_message(
+                f"Only <@{self.member_id}> can use this button.", ephemeral=True
+            )
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        modal = TicketModal(
+            title="Επικύρωση Εισιτηρίου | Ticket Verification", timeout=MODAL_TIMEOUT
+        )
         await interaction.response.send_modal(modal)
         await modal.wait()
+
+        button = self.item
         if modal.success:
             button.label = "Το εισιτήριο επικυρώθηκε! | Ticket Claimed!"
             button.style = discord.ButtonStyle.success
             button.emoji = discord.PartialEmoji(name="✅")
             button.disabled = True
-            self.timeout = 45
         else:
             button.label = "Προσπάθησε ξανά | Try again"
             button.emoji = discord.PartialEmoji(name="🔄")
-        await self._edit(view=self)
-
-    async def on_timeout(self) -> None:
-        await delete_private_thread(
-            config.TICKET_CHANNEL_ID,
-            config.TICKET_THREAD_PREFIX,
-            self.member,
-            "ticket verification timed out",
-        )
+
+        # The view was rebuilt from the message and is only needed to edit it
+        assert self.view is not None and interaction.message is not None
+        self.view.stop()
+        await interaction.message.edit(view=self.view)
+
+        if modal.success:
+            assert isinstance(interaction.user, discord.Member), "User was not a member."
+            await asyncio.sleep(CLAIMED_THREAD_LIFETIME)
+            await delete_private_thread(
+                config.TICKET_CHANNEL_ID,
+                config.TICKET_THREAD_PREFIX,
+                interaction.user,
+                "ticket verification completed",
+            )
+
+
+class TicketView(discord.ui.View):
+    """The message components of a ticket thread, holding the claim button of its member.
+
+    The view is stopped right away, so sending it does not keep it in memory. Clicks are
+    handled by the registered ClaimTicketButton class instead.
+    """
+
+    def __init__(self, member_id: int) -> None:
+        super().__init__(timeout=None)
+        self.add_item(ClaimTicketButton(member_id))
+        self.stop()
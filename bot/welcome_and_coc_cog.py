@@ -1,13 +1,21 @@
-import asyncio
+import functools
 import logging
 
 import discord
 from discord.ext import commands
 
 from bot import config, db, messages
+from bot.flag_writer import member_flag_writer
+from bot.guild_registry import guild_registry
+from bot.invalidation import invalidation_bus
+from bot.member_cache import member_cache
 from bot.models import Member
+from bot.rate_limits import listener_check, reaction_limiter
+from bot.reaction_sync import sync_reactions
 from bot.roles import assign_role
 from bot.senders import delete_private_thread, send_private_message_in_thread
+from bot.views.coc_view import CocView
+from bot.work_queue import event_queue
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +32,52 @@ class WelcomeAndCoC(commands.Cog):
         """Initialize the cog with the bot instance."""
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        """Registers the persistent "Accept CoC" button of the button onboarding mode and keeps
+        the member cache current."""
+        invalidation_bus.subscribe("members", member_cache.invalidate)
+        await member_flag_writer.start()
+        if config.ONBOARDING_MODE == "button":
+            self.bot.add_view(CocView(self.bot))
+
+    async def cog_unload(self) -> None:
+        """Handle the member events and commit the member flags that are still queued before the
+        cog goes away."""
+        await event_queue.close()
+        await member_flag_writer.close()
+
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
         """Called when a member joins the server."""
+        await event_queue.submit(member.id, functools.partial(self.welcome_member, member))
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        """Called when a member leaves the server."""
+        await event_queue.submit(member.id, functools.partial(self.forget_member, member))
 
-        async with db.get_session() as session:
-            # Get or create the member in database
-            db_member, created_now = await Member.get_or_create(member.id, session=session)
+    @commands.Cog.listener()
+    @listener_check(reaction_limiter)
+    async def on_member_reacted_to_coc(self, member: discord.Member) -> None:
+        """Called when a member reacts to the Code of Conduct message."""
+        await event_queue.submit(member.id, functools.partial(self.accept_coc, member))
+
+    @commands.Cog.listener()
+    async def on_member_accepted_coc_with_button(self, member: discord.Member) -> None:
+        """Called when a member presses the Accept CoC button, which has its own rate limit."""
+        await event_queue.submit(member.id, functools.partial(self.accept_coc, member))
+
+    async def welcome_member(self, member: discord.Member) -> None:
+        """Adds a new member to the database and, in the threads onboarding mode, opens their
+        private CoC thread."""
+
+        # Get or create the member in database
+        db_member, created_now = await member_cache.get_or_create_member(member.id)
+
+        if config.ONBOARDING_MODE == "button":
+            # The member is onboarded by the button in the CoC channel, without any REST call
+            logger.info(f"Member {member.name} ({member.id}) joined, waiting for the CoC button.")
+            return
 
         # Prepare welcome message
         if not created_now:
@@ -52,21 +99,14 @@ class WelcomeAndCoC(commands.Cog):
             message_content,
             f"Private {config.COC_THREAD_PREFIX} thread for {member.name} ({member.id})",
         )
-        try:
-            async with db.get_session() as session:
-                db_member.dm_sent = True
-                session.add(db_member)
-
-            logger.info(f"Updated dm_sent=True for {member.name} ({member.id}) in database.")
-        except Exception as e:
-            logger.error(f"Error updating dm_sent for {member.name} ({member.id}): {e}")
+        # Committed with the other queued flags by the flag writer
+        member_cache.queue_flags(member.id, dm_sent=True)
+        logger.info(f"Queued dm_sent=True for {member.name} ({member.id}).")
 
-    @commands.Cog.listener()
-    async def on_member_remove(self, member: discord.Member) -> None:
-        """Called when a member leaves the server."""
+    async def forget_member(self, member: discord.Member) -> None:
+        """Deletes the CoC thread of a member that left and resets their flags."""
 
-        async with db.get_session() as session:
-            db_member, _ = await Member.get_or_create(member.id, session=session)
+        db_member, _ = await member_cache.get_or_create_member(member.id)
 
         if db_member.dm_sent and not db_member.reacted:
             await delete_private_thread(
@@ -80,45 +120,33 @@ class WelcomeAndCoC(commands.Cog):
                 f"Member {member.name} ({member.id}) left the guild but there was no CoC thread to delete."
             )
 
-        db_member.dm_sent = False
-        db_member.reacted = False
-        try:
-            async with db.get_session() as session:
-                session.add(db_member)
-                logger.info(
-                    f"Updated dm_sent=False and reacted=False for {member.name} ({member.id}) in database."
-                )
-        except Exception as e:
-            logger.error(
-                f"Error updating dm_sent and reacted for {member.name} ({member.id}): {e}"
-            )
+        if not db_member.dm_sent and not db_member.reacted:
+            # Nothing to reset, so a known member leaving does not touch the database
+            return
+        member_cache.queue_flags(member.id, dm_sent=False, reacted=False)
+        logger.info(f"Queued dm_sent=False and reacted=False for {member.name} ({member.id}).")
 
-    @commands.Cog.listener()
-    async def on_member_reacted_to_coc(self, member: discord.Member) -> None:
+    async def accept_coc(self, member: discord.Member) -> None:
         """
         Grants the 'members' role and updates the database when a user reacts to the Code of Conduct message.
         Also invokes the new_member_reacted_to_coc event so the ticket-verification cog can handle it.
         """
 
-        logger.info("Event on_member_reacted_to_coc triggered.")
+        logger.info(f"Accepting CoC for {member.name} ({member.id}).")
 
         if not await assign_role(member, config.MEMBER_ROLE_NAME):
             return
 
-        async with db.get_session() as session:
-            db_member, _ = await Member.get_or_create(id=member.id, session=session)
-            if db_member.reacted:
-                logger.info("Member already reacted to CoC message.")
-            else:
-                db_member.reacted = True
-                try:
-                    session.add(db_member)
-                    logger.info(
-                        f"Updated reacted=True for {member.name} ({member.id}) in database."
-                    )
-                except Exception as e:
-                    logger.error(f"Error updating reacted for {member.name} ({member.id}): {e}")
-                    return
+        db_member, _ = await member_cache.get_or_create_member(member.id)
+        if db_member.reacted:
+            logger.info("Member already reacted to CoC message.")
+        else:
+            try:
+                await member_cache.set_flags(member.id, reacted=True)
+                logger.info(f"Updated reacted=True for {member.name} ({member.id}) in database.")
+            except Exception as e:
+                logger.error(f"Error updating reacted for {member.name} ({member.id}): {e}")
+                return
 
         # This opens a new thread for ticket verification. Should be deactivate when a PyCon is not
         # on. TODO: Reactivate it when PyCon Greece 2026 is in the works.
@@ -131,6 +159,29 @@ class WelcomeAndCoC(commands.Cog):
             f"{member.name} ({member.id}) reacted to coc message",
         )
 
+    @commands.command()
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def postcocbutton(self, ctx: commands.Context[commands.Bot]) -> None:
+        """Post the "Accept CoC" button of the button onboarding mode in the CoC channel."""
+        logger.info("Received post CoC button command.")
+        assert ctx.guild is not None
+
+        if config.ONBOARDING_MODE != "button":
+            await ctx.reply("Set ONBOARDING_MODE=button to use the CoC button.")
+            return
+
+        channel = guild_registry.text_channel(ctx.guild, config.COC_CHANNEL_ID)
+        if channel is None:
+            await ctx.reply("Could not find the CoC channel.")
+            return
+
+        await channel.send(
+            messages.COC_BUTTON_MESSAGE.format(link=config.COC_MESSAGE_LINK),
+            view=CocView(self.bot),
+        )
+        await ctx.reply("CoC button posted.")
+
     @commands.command()
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
@@ -139,8 +190,8 @@ class WelcomeAndCoC(commands.Cog):
         logger.info("Received sync DB COC reactions command.")
         assert ctx.guild is not None
 
-        channel = ctx.guild.get_channel(config.COC_CHANNEL_ID)
-        if channel is None or not isinstance(channel, discord.TextChannel):
+        channel = guild_registry.text_channel(ctx.guild, config.COC_CHANNEL_ID)
+        if channel is None:
             await ctx.reply("Could not find the CoC channel.")
             return
 
@@ -153,38 +204,32 @@ class WelcomeAndCoC(commands.Cog):
             await ctx.reply("Missing permissions to fetch the CoC message.")
             return
 
-        updated_users = set()
-        reactions = [
-            reaction
-            for reaction in message.reactions
-            if reaction.emoji in config.ACCEPTABLE_REACTION_EMOJIS
-        ]
-        batch_size = 20  # Number of users to process before sleeping
-        sleep_duration = 1.5  # Seconds to sleep between batches
-
-        async with db.get_session() as session:
-            for reaction in reactions:
-                try:
-                    users = [user async for user in reaction.users()]
-                except discord.HTTPException as e:
-                    logger.warning(f"Failed to fetch users for reaction {reaction.emoji}: {e}")
-                    continue
-
-                for i, member in enumerate(users):
-                    if member.bot:
-                        continue  # Skip bots
-                    db_member, _ = await Member.get_or_create(member.id, session=session)
-                    if not db_member.reacted:
-                        db_member.reacted = True
-                        session.add(db_member)
-                        updated_users.add(member)
-
-                    # Throttle every batch_size users
-                    if (i + 1) % batch_size == 0:
-                        await asyncio.sleep(sleep_duration)
-
-        await ctx.reply(f"COC reactions synced for {len(updated_users)} users.")
-        logger.info(f"Synced {len(updated_users)} users to the database.")
+        progress_message = await ctx.reply("Syncing CoC reactions...")
+
+        async def report_progress(users: int, inserted: int, updated: int) -> None:
+            await progress_message.edit(
+                content=f"Syncing CoC reactions... {users} users processed "
+                f"(inserted: {inserted}, updated: {updated})."
+            )
+
+        try:
+            inserted, updated = await sync_reactions(
+                message, config.ACCEPTABLE_REACTION_EMOJIS, on_progress=report_progress
+            )
+        except discord.HTTPException as e:
+            logger.warning(f"CoC reactions sync was interrupted: {e}")
+            await progress_message.edit(
+                content="CoC reactions sync was interrupted. Run the command again to resume."
+            )
+            return
+
+        await progress_message.edit(
+            content=f"COC reactions synced for {inserted + updated} users "
+            f"(inserted: {inserted}, updated: {updated})."
+        )
+        logger.info(
+            f"Synced CoC reactions to the database. Inserted: {inserted}, Updated: {updated}"
+        )
 
     @commands.command()
     @commands.guild_only()
@@ -194,37 +239,32 @@ class WelcomeAndCoC(commands.Cog):
         logger.info("Received sync DB Member role command.")
         assert ctx.guild is not None
 
-        member_role = discord.utils.get(ctx.guild.roles, name=config.MEMBER_ROLE_NAME)
+        member_role = guild_registry.role(ctx.guild, config.MEMBER_ROLE_NAME)
 
         if member_role is None:
             await ctx.reply("❌ Could not find the Member role.", ephemeral=True, delete_after=10)
             return
 
-        updated_count = 0
-        failed_count = 0
-
         await ctx.reply(
             "Starting sync for members with the Member role...", ephemeral=True, delete_after=10
         )
 
-        async with db.get_session() as session:
-            for member in member_role.members:
-                try:
-                    db_member, _ = await Member.get_or_create(member.id, session=session)
-                    if not db_member.reacted:
-                        db_member.reacted = True
-                        session.add(db_member)
-                        logger.info(f"Set reacted=True for {member.name} ({member.id})")
-                        updated_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to update {member.name} ({member.id}): {e}")
-                    failed_count += 1
+        member_ids = [member.id for member in member_role.members]
+        try:
+            async with db.get_session() as session:
+                inserted, updated = await Member.bulk_mark_reacted(member_ids, session=session)
+            for member_id in member_ids:
+                member_cache.invalidate(member_id)
+        except Exception as e:
+            logger.error(f"Failed to sync {len(member_ids)} members with the Member role: {e}")
+            await ctx.reply(
+                f"❌ Sync failed for {len(member_ids)} members.", ephemeral=True, delete_after=60
+            )
+            return
 
         await ctx.reply(
-            f"✅ Sync complete. Updated: {updated_count}, Failed: {failed_count}",
+            f"✅ Sync complete. Inserted: {inserted}, Updated: {updated}",
             ephemeral=True,
             delete_after=60,
         )
-        logger.info(
-            f"Finished syncing Member role. Updated: {updated_count}, Failed: {failed_count}"
-        )
+        logger.info(f"Finished syncing Member role. Inserted: {inserted}, Updated: {updated}")
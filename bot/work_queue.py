@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable
+
+from bot import config
+
+logger = logging.getLogger(__name__)
+
+type Job = Callable[[], Awaitable[None]]
+
+
+class MemberWorkQueue:
+    """A bounded queue of jobs run by a fixed pool of workers.
+
+    The jobs of every member are chained in the order they were submitted and only the member
+    is queued, once, until its chain is empty. A worker runs the next job of a member and
+    queues the member again behind the others if more jobs are waiting, so the jobs of a member
+    run one at a time and in order, while a slow job only holds up its own member and every
+    other worker keeps going. When `max_size` jobs are waiting, submitting waits until a worker
+    catches up, which pushes back on the listeners instead of letting an event burst pile up
+    database sessions and HTTP requests.
+    """
+
+    def __init__(self, workers: int, max_size: int, drain_timeout: float) -> None:
+        self.workers = workers
+        self.max_size = max_size
+        self.drain_timeout = drain_timeout
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._chains: dict[int, deque[Job]] = {}
+        self._room = asyncio.Semaphore(max_size)
+        self._tasks: list[asyncio.Task[None]] = []
+        self.depth = 0  # jobs waiting to run
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+
+    def start(self) -> None:
+        """Starts the workers, if they are not running already."""
+        if self._tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._chains = {}
+        self._room = asyncio.Semaphore(self.max_size)
+        self.depth = 0
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"member-work-queue-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} event workers.")
+
+    async def submit(self, member_id: int, job: Job) -> None:
+        """Queues a job of a member, waiting for room if the queue is full."""
+        self.start()
+        await self._room.acquire()
+        chain = self._chains.get(member_id)
+        if chain is None:
+            self._chains[member_id] = deque([job])
+            self._ready.put_nowait(member_id)
+        else:
+            # The member is queued or running already and picks the job up when its turn comes
+            chain.append(job)
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    async def join(self) -> None:
+        """Waits until every queued job has run."""
+        await self._ready.join()
+
+    async def close(self) -> None:
+        """Runs the jobs that are already queued, for at most `drain_timeout` seconds, and stops
+        the workers."""
+        if not self._tasks:
+            return
+        try:
+            async with asyncio.timeout(self.drain_timeout):
+                await self.join()
+        except TimeoutError:
+            logger.warning(
+                f"Dropped {self.depth} queued and {self.in_flight} running events after "
+                f"waiting {self.drain_timeout} seconds for them on shutdown."
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Stopped the event workers.")
+
+    async def _work(self) -> None:
+        while True:
+            member_id = await self._ready.get()
+            chain = self._chains[member_id]
+            job = chain.popleft()
+            self.depth -= 1
+            self._room.release()
+            self.in_flight += 1
+            try:
+                await job()
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error processing queued event {job}: {e}")
+            finally:
+                self.in_flight -= 1
+                if chain:
+                    self._ready.put_nowait(member_id)
+                else:
+                    del self._chains[member_id]
+                self._ready.task_done()
+
+
+event_queue = MemberWorkQueue(
+    config.EVENT_WORKERS, config.EVENT_QUEUE_SIZE, config.EVENT_DRAIN_TIMEOUT
+)
@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from bot import messages
+from bot.rate_limits import coc_button_limiter, reaction_limiter
+from bot.views import coc_view
+from bot.views.coc_view import CocView
+
+
+@pytest.fixture
+def mock_assign_role(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Mock the role assignment of the button."""
+    assign_role = AsyncMock(return_value=True)
+    monkeypatch.setattr(coc_view, "assign_role", assign_role)
+    return assign_role
+
+
+def make_interaction(member: MagicMock) -> MagicMock:
+    interaction = MagicMock(spec=discord.Interaction)
+    interaction.user = member
+    interaction.response.send_message = AsyncMock()
+    interaction.response.defer = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    return interaction
+
+
+async def test_coc_view_dispatches_acceptance(
+    mock_bot: MagicMock, mock_discord_member: MagicMock, mock_assign_role: AsyncMock
+) -> None:
+    """Test that pressing the button assigns the role before telling the member they are in."""
+    mock_discord_member.get_role.return_value = None
+    interaction = make_interaction(mock_discord_member)
+    view = CocView(mock_bot)
+
+    await view.accept_callback.callback(interaction)
+
+    interaction.response.defer.assert_awaited_once_with(ephemeral=True, thinking=True)
+    mock_assign_role.assert_awaited_once()
+    interaction.followup.send.assert_awaited_once_with(
+        messages.COC_ACCEPTED_MESSAGE, ephemeral=True
+    )
+    mock_bot.dispatch.assert_called_once_with(
+        "member_accepted_coc_with_button", member=mock_discord_member
+    )
+
+
+async def test_coc_view_reports_role_assignment_failure(
+    mock_bot: MagicMock, mock_discord_member: MagicMock, mock_assign_role: AsyncMock
+) -> None:
+    """Test that a member whose role could not be assigned is told so and not onboarded."""
+    mock_discord_member.get_role.return_value = None
+    mock_assign_role.return_value = False
+    interaction = make_interaction(mock_discord_member)
+    view = CocView(mock_bot)
+
+    await view.accept_callback.callback(interaction)
+
+    interaction.followup.send.assert_awaited_once()
+    assert interaction.followup.send.await_args.args[0] != messages.COC_ACCEPTED_MESSAGE
+    mock_bot.dispatch.assert_not_called()
+
+
+async def test_coc_view_ignores_accepted_members(
+    mock_bot: MagicMock, mock_discord_member: MagicMock, mock_discord_role: MagicMock
+) -> None:
+    """Test that members who already have the member role are not onboarded again."""
+    mock_discord_member.get_role.return_value = mock_discord_role
+    interaction = make_interaction(mock_discord_member)
+    view = CocView(mock_bot)
+
+    await view.accept_callback.callback(interaction)
+
+    interaction.response.send_message.assert_awaited_once()
+    mock_bot.dispatch.assert_not_called()
+
+
+async def test_coc_view_has_its_own_rate_limit(mock_bot: MagicMock) -> None:
+    """Test that reactions of a member do not use up the rate limit of the button."""
+    interaction = make_interaction(MagicMock(id=987654321))
+    interaction.guild_id = 1
+    for _ in range(reaction_limiter.rate):
+        reaction_limiter.hit(1, 987654321)
+    view = CocView(mock_bot)
+
+    assert await view.interaction_check(interaction)
+    for _ in range(coc_button_limiter.rate - 1):
+        assert await view.interaction_check(interaction)
+    assert not await view.interaction_check(interaction)
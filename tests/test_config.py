@@ -55,6 +55,21 @@ def test_get_env_var_int_not_integer() -> None:
         config.get_env_var_int("TEST_INT")
 
 
+@patch.dict(os.environ, {"TEST_RATE": "3/60"})
+def test_get_env_var_rate_with_value() -> None:
+    """Test that get_env_var_rate returns the times and seconds of the rate"""
+    assert config.get_env_var_rate("TEST_RATE") == (3, 60.0)
+
+
+@patch.dict(os.environ, {"TEST_RATE": "often"})
+def test_get_env_var_rate_not_a_rate() -> None:
+    """Test that get_env_var_rate raises an exception when var is not a rate"""
+    with pytest.raises(
+        IncorrectConfigException, match="TEST_RATE must be written as <times>/<seconds>"
+    ):
+        config.get_env_var_rate("TEST_RATE")
+
+
 @patch.dict(
     os.environ,
     {
@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.cooldowns import CooldownStore, DatabaseCooldownBackend, create_cooldown_backend
+from bot.exceptions import IncorrectConfigException
+from bot.models import ReactionCooldown
+
+
+def test_cooldown_store_expire_removes_only_expired_entries() -> None:
+    """Test that expiring stops at the first cooldown that is still active."""
+    store = CooldownStore(expiry_seconds=60)
+    store.add(1, 10, now=0)
+    store.add(1, 20, now=30)
+
+    assert store.expire(now=59) == 0
+    assert store.expire(now=60) == 1
+    assert not store.is_active(1, 10, now=60)
+    assert store.is_active(1, 20, now=60)
+    assert len(store) == 1
+
+
+def test_cooldown_store_restarted_cooldown_is_kept() -> None:
+    """Test that the stale deadline of a restarted cooldown does not expire it."""
+    store = CooldownStore(expiry_seconds=60)
+    store.add(1, 10, now=0)
+    store.add(1, 10, now=45)
+
+    assert store.expire(now=60) == 0
+    assert store.is_active(1, 10, now=60)
+    assert store.expire(now=105) == 1
+    assert len(store) == 0
+
+
+async def test_database_backend_shares_flushed_cooldowns(mock_session: AsyncSession) -> None:
+    """Test that a cooldown is visible to another backend once it has been flushed."""
+    first = DatabaseCooldownBackend(expiry_seconds=60)
+    second = DatabaseCooldownBackend(expiry_seconds=60, miss_seconds=0)
+
+    await first.add(1, 10)
+    assert await first.is_active(1, 10)
+    assert not await second.is_active(1, 10)
+
+    await first.flush()
+    assert await second.is_active(1, 10)
+    assert not await second.is_active(1, 20)
+
+
+async def test_database_backend_remembers_misses(
+    mock_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a user found without a cooldown is not looked up again for a while."""
+    is_active = AsyncMock(return_value=False)
+    monkeypatch.setattr(ReactionCooldown, "is_active", is_active)
+    backend = DatabaseCooldownBackend(expiry_seconds=60)
+
+    assert not await backend.is_active(1, 10)
+    assert not await backend.is_active(1, 10)
+    assert not await backend.is_active(1, 20)
+
+    assert is_active.await_count == 2
+
+
+async def test_database_backend_expire_deletes_expired_rows(mock_session: AsyncSession) -> None:
+    """Test that expiring removes the rows whose expiry has passed."""
+    backend = DatabaseCooldownBackend(expiry_seconds=0)
+    await backend.add(1, 10)
+
+    assert await backend.expire() == 1
+    result = await mock_session.execute(select(ReactionCooldown))
+    assert result.scalars().all() == []
+
+
+def test_create_cooldown_backend_unknown_name() -> None:
+    """Test that an unknown backend name is reported as a configuration error."""
+    with pytest.raises(IncorrectConfigException, match="Unknown cooldown backend redis"):
+        create_cooldown_backend("redis", 60)
@@ -0,0 +1,52 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.flag_writer import MemberFlagWriter
+from bot.models import Member
+
+
+async def test_flag_writer_coalesces_updates(mock_session: AsyncSession) -> None:
+    """Test that the queued flags of a member are coalesced and flushed in one batch."""
+    mock_session.add_all([Member(id=1, reacted=True), Member(id=2)])
+    await mock_session.flush()
+
+    writer = MemberFlagWriter(interval=60, max_rows=10)
+    writer.add(1, {"dm_sent": True})
+    writer.add(1, {"reacted": False})
+    writer.add(1, {"dm_sent": False})
+    writer.add(2, {"dm_sent": True})
+    assert writer.pending(1) == {"dm_sent": False, "reacted": False}
+
+    assert await writer.flush() == 2
+    assert len(writer) == 0
+    assert writer.pending(1) == {}
+    assert await writer.flush() == 0
+
+    member_1 = await Member.get_by_id(1, session=mock_session)
+    member_2 = await Member.get_by_id(2, session=mock_session)
+    await mock_session.refresh(member_1)
+    await mock_session.refresh(member_2)
+    assert member_1 is not None and not member_1.dm_sent and not member_1.reacted
+    assert member_2 is not None and member_2.dm_sent and not member_2.reacted
+
+
+async def test_flag_writer_flushes_when_full_and_on_close(mock_session: AsyncSession) -> None:
+    """Test that a full queue is flushed without waiting for the interval and that closing
+    flushes the rest."""
+    mock_session.add_all([Member(id=id) for id in range(1, 4)])
+    await mock_session.flush()
+
+    writer = MemberFlagWriter(interval=60, max_rows=2)
+    await writer.start()
+    writer.add(1, {"dm_sent": True})
+    writer.add(2, {"dm_sent": True})
+    async with asyncio.timeout(1):
+        while writer.flushes == 0:
+            await asyncio.sleep(0.01)
+    assert len(writer) == 0
+
+    writer.add(3, {"reacted": True})
+    await writer.close()
+    assert writer.flushes == 2
+    assert writer.flushed_rows == 3
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import discord
+
+from bot.guild_registry import GuildRegistry
+
+
+def make_role(name: str) -> MagicMock:
+    role = MagicMock(spec=discord.Role)
+    role.name = name
+    return role
+
+
+def make_guild(roles: list[MagicMock], channels: dict[int, MagicMock]) -> MagicMock:
+    guild = MagicMock(spec=discord.Guild)
+    guild.id = 1
+    guild.name = "PyGreece"
+    guild.roles = roles
+    guild.get_channel.side_effect = channels.get
+    return guild
+
+
+def test_guild_registry_resolves_configured_entities() -> None:
+    """Test that configured roles and channels are resolved once and missing ones reported."""
+    members = make_role("members")
+    channel = MagicMock(spec=discord.TextChannel)
+    guild = make_guild([make_role("@everyone"), members, make_role("members")], {10: channel})
+    registry = GuildRegistry(role_names=("members", "organizers"), channel_ids=(10, 20))
+
+    missing = registry.load(guild)
+
+    assert missing == {"role 'organizers'", "text channel with id=20"}
+    guild.roles = []  # lookups no longer scan the guild
+    guild.get_channel.reset_mock()
+    assert registry.role(guild, "members") is members
+    assert registry.role(guild, "organizers") is None
+    assert registry.text_channel(guild, 10) is channel
+    assert registry.text_channel(guild, 20) is None
+    guild.get_channel.assert_not_called()
+
+
+def test_guild_registry_reload_and_fallback() -> None:
+    """Test that reloading picks up new roles and unloaded guilds fall back to a scan."""
+    organizers = make_role("organizers")
+    guild = make_guild([], {})
+    registry = GuildRegistry(role_names=("organizers",), channel_ids=())
+
+    assert registry.role(guild, "organizers") is None
+    registry.load(guild)
+    guild.roles = [organizers]
+    assert registry.role(guild, "organizers") is None
+
+    assert registry.load(guild) == set()
+    assert registry.role(guild, "organizers") is organizers
+
+    registry.forget(guild)
+    guild.roles = []
+    assert registry.role(guild, "organizers") is None
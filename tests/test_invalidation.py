@@ -0,0 +1,39 @@
+from unittest.mock import MagicMock
+
+from bot.invalidation import LocalInvalidationBus, PostgresInvalidationBus
+
+
+def test_local_invalidation_bus_notifies_subscribers() -> None:
+    """Test that only the handlers of the changed table are called, and that a failing handler
+    does not stop the others."""
+    bus = LocalInvalidationBus()
+    members: list[int | None] = []
+    tickets: list[int | None] = []
+
+    def fail(key: int | None) -> None:
+        raise RuntimeError("cache is broken")
+
+    bus.subscribe("members", fail)
+    bus.subscribe("members", members.append)
+    bus.subscribe("tickets", tickets.append)
+
+    bus.notify("members", 1234)
+    assert members == [1234]
+    assert tickets == []
+
+    bus.notify_all()
+    assert members == [1234, None]
+    assert tickets == [None]
+
+
+def test_postgres_invalidation_bus_parses_notifications() -> None:
+    """Test that notifications are routed by table, with the row key when there is one."""
+    bus = PostgresInvalidationBus(MagicMock())
+    keys: list[int | None] = []
+    bus.subscribe("members", keys.append)
+
+    bus._on_notification(None, 1, "cache_invalidation", "members:1234")
+    bus._on_notification(None, 1, "cache_invalidation", "members")
+    bus._on_notification(None, 1, "cache_invalidation", "tickets")
+
+    assert keys == [1234, None]
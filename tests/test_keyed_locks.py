@@ -0,0 +1,54 @@
+import asyncio
+
+from bot.keyed_locks import KeyedLocks
+
+
+async def test_keyed_locks_serialize_same_key_only() -> None:
+    """Test that holders of a key run one at a time while other keys run concurrently."""
+    locks: KeyedLocks[tuple[int, str]] = KeyedLocks()
+    running: dict[tuple[int, str], int] = {}
+    peak: dict[tuple[int, str], int] = {}
+
+    async def work(key: tuple[int, str]) -> None:
+        async with locks.hold(key):
+            running[key] = running.get(key, 0) + 1
+            peak[key] = max(peak.get(key, 0), running[key])
+            await asyncio.sleep(0.01)
+            running[key] -= 1
+
+    keys = [(1, "welcome")] * 3 + [(2, "welcome"), (1, "ticket")]
+    await asyncio.gather(*(work(key) for key in keys))
+
+    assert peak == {(1, "welcome"): 1, (2, "welcome"): 1, (1, "ticket"): 1}
+    assert len(locks) == 0
+
+
+async def test_keyed_locks_free_cancelled_waiters() -> None:
+    """Test that a lock is dropped once its holder and its cancelled waiters are gone."""
+    locks: KeyedLocks[int] = KeyedLocks()
+    held = asyncio.Event()
+    release = asyncio.Event()
+
+    async def holder() -> None:
+        async with locks.hold(1):
+            held.set()
+            await release.wait()
+
+    async def waiter() -> None:
+        async with locks.hold(1):
+            pass
+
+    holder_task = asyncio.create_task(holder())
+    await held.wait()
+    waiter_task = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+    assert locks.locked(1)
+
+    waiter_task.cancel()
+    await asyncio.gather(waiter_task, return_exceptions=True)
+    assert len(locks) == 1
+
+    release.set()
+    await holder_task
+    assert len(locks) == 0
+    assert not locks.locked(1)
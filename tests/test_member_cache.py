@@ -0,0 +1,49 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.flag_writer import MemberFlagWriter
+from bot.member_cache import MemberCache
+from bot.models import Member
+from bot.states import MemberState
+
+
+def test_member_cache_evicts_and_expires() -> None:
+    """Test that the least recently used and the expired entries are dropped and counted."""
+    cache = MemberCache(max_size=2, ttl=10, writer=MemberFlagWriter(interval=60, max_rows=10))
+    cache.put(MemberState(1, True, False, None), now=0)
+    cache.put(MemberState(2, True, True, None), now=0)
+
+    assert cache.get(1, now=1) is not None  # 2 is now the least recently used
+    cache.put(MemberState(3, False, False, None), now=1)
+
+    assert cache.get(2, now=2) is None
+    assert cache.get(1, now=2) is not None
+    assert cache.get(3, now=11) is None  # expired
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 2, 1)
+
+
+async def test_member_cache_reads_and_writes_through(mock_session: AsyncSession) -> None:
+    """Test that a cached member is served without the database and flags are written through."""
+    cache = MemberCache(max_size=10, ttl=60, writer=MemberFlagWriter(interval=60, max_rows=10))
+    member, created = await cache.get_or_create_member(1234)
+    assert created
+    assert not member.dm_sent
+
+    await cache.set_flags(1234, dm_sent=True)
+    db_member = await Member.get_by_id(1234, session=mock_session)
+    assert db_member is not None and db_member.dm_sent
+
+    # Changed behind the cache, so only invalidating it shows the change
+    db_member.reacted = True
+    await mock_session.flush()
+    member, created = await cache.get_or_create_member(1234)
+    assert not created
+    assert member.dm_sent and not member.reacted
+    assert cache.hits == 1
+
+    # Queued flags apply to the members read again before they are flushed
+    cache.queue_flags(1234, dm_sent=False)
+    cache.invalidate(1234)
+    member_after = await cache.get_member(1234)
+    assert member_after is not None and member_after.reacted and not member_after.dm_sent
+    assert await cache.get_member(5678) is None
@@ -1,6 +1,9 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.models import Member
+from bot.models import Member, PrivateThread, Ticket
+from bot.states import MemberState, TicketState
 
 
 async def test_member_get_by_id(test_session: AsyncSession) -> None:
@@ -22,6 +25,51 @@ async def test_member_get_by_id(test_session: AsyncSession) -> None:
     assert result is None
 
 
+async def test_member_and_ticket_states(test_session: AsyncSession) -> None:
+    """Test reading members and tickets as immutable states."""
+    test_session.add_all([Ticket(id=1234567890), Ticket(id=1234567899), Member(id=321)])
+    await test_session.flush()
+    test_session.add(Member(id=654, reacted=True, ticket_id=1234567890))
+    await test_session.commit()
+
+    assert await Member.get_state(321, session=test_session) == MemberState(
+        321, False, False, None
+    )
+    assert await Member.get_state(987, session=test_session) is None
+    assert await Member.get_or_create_state(654, session=test_session) == (
+        MemberState(654, False, True, 1234567890),
+        False,
+    )
+    assert await Member.get_or_create_state(987, session=test_session) == (
+        MemberState(987, False, False, None),
+        True,
+    )
+
+    assert await Ticket.get_state(1234567890, session=test_session) == TicketState(
+        1234567890, (654,)
+    )
+    assert await Ticket.get_state(1234567899, session=test_session) == TicketState(1234567899, ())
+    assert await Ticket.get_state(1234567891, session=test_session) is None
+
+
+async def test_relationships_load_on_request(test_session: AsyncSession) -> None:
+    """Test that relationships are only loaded when they are asked for."""
+    test_session.add(Ticket(id=1234567891))
+    await test_session.flush()
+    test_session.add(Member(id=111, reacted=True, ticket_id=1234567891))
+    await test_session.commit()
+    test_session.expunge_all()
+
+    member = await Member.get_by_id(111, session=test_session)
+    assert member is not None
+    with pytest.raises(InvalidRequestError):
+        member.ticket
+
+    ticket = await Ticket.get_by_id(1234567891, session=test_session, with_members=True)
+    assert ticket is not None
+    assert [member.id for member in ticket.members] == [111]
+
+
 async def test_member_get_or_create(test_session: AsyncSession) -> None:
     """Test getting or creating a member."""
     # Test creating a new member
@@ -40,3 +88,54 @@ async def test_member_get_or_create(test_session: AsyncSession) -> None:
     assert member2.id == 456
     assert member2.dm_sent is False
     assert member2.reacted is False
+
+
+async def test_member_get_or_create_does_not_overwrite_existing(
+    test_session: AsyncSession,
+) -> None:
+    """Test that the upsert returns an existing member untouched."""
+    test_session.add(Member(id=789, dm_sent=True, reacted=True))
+    await test_session.commit()
+
+    member, created = await Member.get_or_create(789, session=test_session)
+
+    assert created is False
+    assert member.id == 789
+    assert member.dm_sent is True
+    assert member.reacted is True
+
+
+async def test_member_bulk_mark_reacted(test_session: AsyncSession) -> None:
+    """Test marking many members as reacted in bulk."""
+    test_session.add_all([Member(id=1001), Member(id=1002, reacted=True)])
+    await test_session.commit()
+
+    inserted, updated = await Member.bulk_mark_reacted(
+        [1001, 1002, 1003, 1003, 1004], session=test_session
+    )
+    await test_session.commit()
+
+    assert inserted == 2
+    assert updated == 1
+    for id in (1001, 1002, 1003, 1004):
+        member = await Member.get_by_id(id, session=test_session)
+        assert member is not None
+        assert member.reacted is True
+
+    # Running it again changes nothing
+    assert await Member.bulk_mark_reacted([1001, 1004], session=test_session) == (0, 0)
+
+
+async def test_private_thread_ids(test_session: AsyncSession) -> None:
+    """Test storing, replacing and deleting the thread ID of a member's flow."""
+    assert await PrivateThread.get_thread_id(123, "welcome", session=test_session) is None
+
+    await PrivateThread.set_thread_id(123, "welcome", 1000, session=test_session)
+    await PrivateThread.set_thread_id(123, "ticket", 2000, session=test_session)
+    await PrivateThread.set_thread_id(123, "welcome", 3000, session=test_session)
+    assert await PrivateThread.get_thread_id(123, "welcome", session=test_session) == 3000
+    assert await PrivateThread.get_thread_id(123, "ticket", session=test_session) == 2000
+
+    await PrivateThread.delete_thread_id(123, "welcome", session=test_session)
+    assert await PrivateThread.get_thread_id(123, "welcome", session=test_session) is None
+    assert await PrivateThread.get_thread_id(123, "ticket", session=test_session) == 2000
@@ -0,0 +1,103 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from discord.ext import commands
+
+from bot.exceptions import RateLimitedException
+from bot.rate_limits import (
+    RateLimiter,
+    Scope,
+    command_check,
+    interaction_check,
+    listener_check,
+)
+
+
+def test_rate_limiter_allows_up_to_rate_then_refills() -> None:
+    """Test that a bucket empties after `rate` hits and refills over `per` seconds."""
+    limiter = RateLimiter("test", rate=2, per=10)
+
+    assert limiter.hit(1, 10, now=0) == 0
+    assert limiter.hit(1, 10, now=0) == 0
+    assert limiter.hit(1, 10, now=0) == pytest.approx(5)
+    assert limiter.hit(1, 10, now=5) == 0
+    assert limiter.hit(1, 20, now=5) == 0
+
+
+def test_rate_limiter_scopes() -> None:
+    """Test that buckets are shared according to the scope of the limiter."""
+    guild_limiter = RateLimiter("test", rate=1, per=10, scope=Scope.GUILD)
+    assert guild_limiter.hit(1, 10, now=0) == 0
+    assert guild_limiter.hit(1, 20, now=0) > 0
+    assert guild_limiter.hit(2, 20, now=0) == 0
+
+    member_limiter = RateLimiter("test", rate=1, per=10, scope=Scope.MEMBER)
+    assert member_limiter.hit(1, 10, now=0) == 0
+    assert member_limiter.hit(2, 10, now=0) == 0
+    assert member_limiter.hit(1, 10, now=0) > 0
+
+
+def test_rate_limiter_prunes_refilled_buckets() -> None:
+    """Test that buckets unused for `per` seconds are dropped."""
+    limiter = RateLimiter("test", rate=1, per=10)
+    limiter.hit(1, 10, now=0)
+    limiter.hit(1, 20, now=5)
+
+    limiter.hit(1, 30, now=12)
+
+    assert len(limiter) == 2
+
+
+def test_command_check_takes_tokens_only_when_every_limiter_allows() -> None:
+    """Test that a command rejected by one limiter does not spend the tokens of the others."""
+    member_limiter = RateLimiter("member", rate=2, per=60)
+    guild_limiter = RateLimiter("guild", rate=1, per=60, scope=Scope.GUILD)
+
+    @command_check(member_limiter, guild_limiter)
+    async def command(ctx: commands.Context[Any]) -> None:
+        pass
+
+    [predicate] = command.__commands_checks__  # type: ignore[attr-defined]
+    ctx = MagicMock()
+    ctx.guild.id = 1
+    ctx.author.id = 10
+
+    assert predicate(ctx)
+    with pytest.raises(RateLimitedException) as exc_info:
+        predicate(ctx)
+
+    assert exc_info.value.action == "guild"
+    assert member_limiter.retry_after(1, 10) == 0
+
+
+async def test_listener_check_drops_rate_limited_members(
+    mock_discord_member: MagicMock,
+) -> None:
+    """Test that the decorated listener only runs while the member has tokens left."""
+    calls = []
+
+    class Cog:
+        @listener_check(RateLimiter("test", rate=1, per=60))
+        async def on_event(self, member: discord.Member) -> None:
+            calls.append(member)
+
+    cog = Cog()
+    await cog.on_event(member=mock_discord_member)
+    await cog.on_event(member=mock_discord_member)
+
+    assert calls == [mock_discord_member]
+
+
+async def test_interaction_check_responds_when_rate_limited() -> None:
+    """Test that a rate limited interaction gets an ephemeral response."""
+    limiter = RateLimiter("test", rate=1, per=60)
+    interaction = MagicMock(spec=discord.Interaction)
+    interaction.guild_id = 1
+    interaction.user = MagicMock(id=10)
+    interaction.response.send_message = AsyncMock()
+
+    assert await interaction_check(limiter, interaction)
+    assert not await interaction_check(limiter, interaction)
+    interaction.response.send_message.assert_called_once()
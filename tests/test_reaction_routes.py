@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.exceptions import IncorrectConfigException
+from bot.reaction_routes import build_reaction_routes
+from bot.utility_cog import Utility
+
+
+def test_build_reaction_routes() -> None:
+    """Test that every emoji of every message is routed to its event."""
+    routes = build_reaction_routes([(1, ["👍", "✅"], "first"), (2, ["👍"], "second")])
+
+    assert routes == {1: {"👍": "first", "✅": "first"}, 2: {"👍": "second"}}
+    with pytest.raises(TypeError):
+        routes[1]["🎉"] = "first"  # type: ignore[index]
+
+
+def test_build_reaction_routes_conflict() -> None:
+    """Test that routing the same reaction to two events is a configuration error."""
+    with pytest.raises(IncorrectConfigException, match="routed twice"):
+        build_reaction_routes([(1, ["👍"], "first"), (1, ["👍"], "second")])
+
+
+async def test_on_raw_reaction_add_routes_reaction(
+    mock_bot: MagicMock, mock_reaction_payload: MagicMock, mock_discord_member: MagicMock
+) -> None:
+    """Test that a routed reaction dispatches its event and other messages are ignored."""
+    cog = Utility(mock_bot, reaction_routes=[(mock_reaction_payload.message_id, ["✅"], "event")])
+    cog.anti_spam_task.is_on_cooldown = AsyncMock(return_value=False)
+    cog.anti_spam_task.record_reactor = AsyncMock()
+    mock_reaction_payload.member = mock_discord_member
+
+    await cog.on_raw_reaction_add(mock_reaction_payload)
+    mock_bot.dispatch.assert_called_once_with("event", member=mock_discord_member)
+
+    mock_reaction_payload.message_id = 1
+    await cog.on_raw_reaction_add(mock_reaction_payload)
+    mock_bot.dispatch.assert_called_once()
+    cog.anti_spam_task.is_on_cooldown.assert_awaited_once()
+    await cog.anti_spam_task.close()
@@ -0,0 +1,123 @@
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models import Member, SyncCheckpoint
+from bot.reaction_sync import PAGE_SIZE, checkpoint_prefix, sync_reactions
+
+
+def make_user(id: int, bot: bool = False) -> MagicMock:
+    user = MagicMock(spec=discord.User)
+    user.id = id
+    user.bot = bot
+    return user
+
+
+def make_reaction(emoji: str, users: list[MagicMock]) -> MagicMock:
+    """Create a mock reaction that paginates its users like the discord API."""
+    reaction = MagicMock(spec=discord.Reaction)
+    reaction.emoji = emoji
+    reaction.pages_fetched = 0
+
+    async def fetch_users(
+        *, limit: int, after: discord.abc.Snowflake | None = None
+    ) -> AsyncIterator[MagicMock]:
+        reaction.pages_fetched += 1
+        after_id = after.id if after else 0
+        for user in [user for user in users if user.id > after_id][:limit]:
+            yield user
+
+    reaction.users = fetch_users
+    return reaction
+
+
+@pytest.fixture
+def mock_message() -> MagicMock:
+    message = MagicMock(spec=discord.Message)
+    message.id = 555
+    message.channel = MagicMock(id=666)
+    return message
+
+
+async def test_sync_reactions_dedupes_users_across_emojis(
+    mock_message: MagicMock, mock_session: AsyncSession
+) -> None:
+    """Test that users reacting with several emojis are synced once and bots are skipped."""
+    mock_session.add(Member(id=1))
+    await mock_session.flush()
+    mock_message.reactions = [
+        make_reaction("👍", [make_user(1), make_user(2), make_user(3, bot=True)]),
+        make_reaction("❤️", [make_user(2), make_user(4)]),
+        make_reaction("🐍", [make_user(5)]),
+    ]
+    on_progress = AsyncMock()
+
+    inserted, updated = await sync_reactions(mock_message, ["👍", "❤️"], on_progress=on_progress)
+
+    assert (inserted, updated) == (2, 1)
+    assert await Member.get_by_id(3, session=mock_session) is None
+    assert await Member.get_by_id(5, session=mock_session) is None
+    on_progress.assert_awaited_with(3, 2, 1)
+
+
+async def test_sync_reactions_survives_failed_progress_reports(
+    mock_message: MagicMock, mock_session: AsyncSession
+) -> None:
+    """Test that a progress report that cannot be sent does not stop the sync."""
+    mock_message.reactions = [make_reaction("👍", [make_user(1), make_user(2)])]
+    on_progress = AsyncMock(
+        side_effect=discord.HTTPException(MagicMock(status=404, reason="Not Found"), "gone")
+    )
+
+    inserted, updated = await sync_reactions(mock_message, ["👍"], on_progress=on_progress)
+
+    assert (inserted, updated) == (2, 0)
+    on_progress.assert_awaited()
+
+
+async def test_sync_reactions_resumes_from_checkpoint(
+    mock_message: MagicMock, mock_session: AsyncSession
+) -> None:
+    """Test that a sync resumes after the checkpointed user and clears it when done."""
+    users = [make_user(id) for id in range(1, PAGE_SIZE + 11)]
+    reaction = make_reaction("👍", users)
+    mock_message.reactions = [reaction]
+    key = f"{checkpoint_prefix(mock_message)}👍"
+    await SyncCheckpoint.set_value(key, PAGE_SIZE, session=mock_session)
+
+    inserted, updated = await sync_reactions(mock_message, ["👍"])
+
+    assert (inserted, updated) == (10, 0)
+    assert reaction.pages_fetched == 1
+    assert await SyncCheckpoint.get_value(key, session=mock_session) is None
+
+
+async def test_sync_reactions_logs_every_failed_emoji(
+    mock_session: AsyncSession, mock_message: MagicMock, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that the errors of every failed emoji are logged before one of them is raised."""
+
+    def make_failing_reaction(emoji: str) -> MagicMock:
+        reaction = make_reaction(emoji, [])
+
+        async def fetch_users(**kwargs: object) -> AsyncIterator[MagicMock]:
+            raise discord.HTTPException(MagicMock(status=500, reason=emoji), "failed")
+            yield
+
+        reaction.users = fetch_users
+        return reaction
+
+    mock_message.reactions = [make_failing_reaction("👍"), make_failing_reaction("❤️")]
+
+    with pytest.raises(discord.HTTPException):
+        await sync_reactions(mock_message, ["👍", "❤️"])
+
+    reasons = {
+        record.exc_info[1].response.reason
+        for record in caplog.records
+        if record.exc_info and isinstance(record.exc_info[1], discord.HTTPException)
+    }
+    assert reasons == {"👍", "❤️"}
@@ -0,0 +1,174 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models import PrivateThread
+from bot.senders import delete_private_thread, send_private_message_in_thread
+
+
+def make_channel(guild: MagicMock) -> MagicMock:
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.id = 10
+    channel.name = "welcome"
+    channel.guild = guild
+    channel.threads = []
+    guild.get_channel.return_value = channel
+    guild.get_thread.return_value = None
+    return channel
+
+
+def make_thread(thread_id: int) -> MagicMock:
+    thread = MagicMock(spec=discord.Thread)
+    thread.id = thread_id
+    thread.members = []
+    thread.archived = False
+    thread.locked = False
+    thread.edit = AsyncMock()
+    thread.add_user = AsyncMock()
+    thread.send = AsyncMock()
+    thread.delete = AsyncMock()
+    return thread
+
+
+async def test_send_private_message_stores_thread_id(
+    mock_session: AsyncSession, mock_discord_member: MagicMock
+) -> None:
+    """Test that a created thread is stored and found by ID the next time."""
+    channel = make_channel(mock_discord_member.guild)
+    thread = make_thread(1000)
+    channel.create_thread = AsyncMock(return_value=thread)
+
+    await send_private_message_in_thread(10, "welcome", mock_discord_member, "hi", "test")
+    assert (
+        await PrivateThread.get_thread_id(mock_discord_member.id, "welcome", session=mock_session)
+        == 1000
+    )
+
+    mock_discord_member.guild.get_thread.return_value = thread
+    await send_private_message_in_thread(10, "welcome", mock_discord_member, "hi again", "test")
+    channel.create_thread.assert_awaited_once()
+    assert thread.send.await_count == 2
+
+
+async def test_send_private_message_unarchives_fetched_thread(
+    mock_session: AsyncSession, mock_discord_member: MagicMock
+) -> None:
+    """Test that an archived thread fetched by ID is unarchived before the member is added."""
+    guild = mock_discord_member.guild
+    channel = make_channel(guild)
+    channel.create_thread = AsyncMock()
+    thread = make_thread(1000)
+    thread.archived = True
+    calls = MagicMock()
+    calls.attach_mock(thread.edit, "edit")
+    calls.attach_mock(thread.add_user, "add_user")
+    guild.fetch_channel = AsyncMock(return_value=thread)
+    await PrivateThread.set_thread_id(
+        mock_discord_member.id, "welcome", 1000, session=mock_session
+    )
+
+    await send_private_message_in_thread(10, "welcome", mock_discord_member, "hi", "test")
+
+    guild.fetch_channel.assert_awaited_once_with(1000)
+    channel.create_thread.assert_not_awaited()
+    assert [c[0] for c in calls.mock_calls] == ["edit", "add_user"]
+    thread.edit.assert_awaited_once_with(archived=False)
+    thread.send.assert_awaited_once()
+
+
+async def test_send_private_message_replaces_locked_thread(
+    mock_session: AsyncSession, mock_discord_member: MagicMock
+) -> None:
+    """Test that a locked thread is replaced by a new one, whose ID is stored."""
+    guild = mock_discord_member.guild
+    channel = make_channel(guild)
+    locked = make_thread(1000)
+    locked.archived = True
+    locked.locked = True
+    guild.fetch_channel = AsyncMock(return_value=locked)
+    thread = make_thread(2000)
+    channel.create_thread = AsyncMock(return_value=thread)
+    await PrivateThread.set_thread_id(
+        mock_discord_member.id, "welcome", 1000, session=mock_session
+    )
+
+    await send_private_message_in_thread(10, "welcome", mock_discord_member, "hi", "test")
+
+    locked.edit.assert_not_awaited()
+    locked.send.assert_not_awaited()
+    thread.send.assert_awaited_once()
+    assert (
+        await PrivateThread.get_thread_id(mock_discord_member.id, "welcome", session=mock_session)
+        == 2000
+    )
+
+
+async def test_send_private_message_replaces_forbidden_thread(
+    mock_session: AsyncSession, mock_discord_member: MagicMock
+) -> None:
+    """Test that a thread the bot can no longer fetch is forgotten and replaced."""
+    guild = mock_discord_member.guild
+    channel = make_channel(guild)
+    guild.fetch_channel = AsyncMock(
+        side_effect=discord.Forbidden(MagicMock(status=403, reason="Forbidden"), "no access")
+    )
+    thread = make_thread(2000)
+    channel.create_thread = AsyncMock(return_value=thread)
+    await PrivateThread.set_thread_id(
+        mock_discord_member.id, "welcome", 1000, session=mock_session
+    )
+
+    await send_private_message_in_thread(10, "welcome", mock_discord_member, "hi", "test")
+
+    thread.send.assert_awaited_once()
+    assert (
+        await PrivateThread.get_thread_id(mock_discord_member.id, "welcome", session=mock_session)
+        == 2000
+    )
+
+
+async def test_delete_private_thread_fetches_archived_thread(
+    mock_session: AsyncSession, mock_discord_member: MagicMock
+) -> None:
+    """Test that a thread missing from the cache is fetched by ID and deleted."""
+    guild = mock_discord_member.guild
+    make_channel(guild)
+    thread = make_thread(1000)
+    guild.fetch_channel = AsyncMock(return_value=thread)
+    await PrivateThread.set_thread_id(
+        mock_discord_member.id, "welcome", 1000, session=mock_session
+    )
+
+    await delete_private_thread(10, "welcome", mock_discord_member, "test")
+
+    guild.fetch_channel.assert_awaited_once_with(1000)
+    thread.delete.assert_awaited_once()
+    assert (
+        await PrivateThread.get_thread_id(mock_discord_member.id, "welcome", session=mock_session)
+        is None
+    )
+
+
+async def test_concurrent_sends_create_one_thread(
+    mock_session: AsyncSession, mock_discord_member: MagicMock
+) -> None:
+    """Test that concurrent messages to the same member and flow share a single thread."""
+    channel = make_channel(mock_discord_member.guild)
+    thread = make_thread(1000)
+
+    async def create_thread(**kwargs: object) -> MagicMock:
+        await asyncio.sleep(0.01)
+        return thread
+
+    channel.create_thread = AsyncMock(side_effect=create_thread)
+    mock_discord_member.guild.fetch_channel = AsyncMock(return_value=thread)
+
+    await asyncio.gather(
+        send_private_message_in_thread(10, "welcome", mock_discord_member, "hi", "join"),
+        send_private_message_in_thread(10, "welcome", mock_discord_member, "hi", "command"),
+    )
+
+    channel.create_thread.assert_awaited_once()
+    assert thread.send.await_count == 2
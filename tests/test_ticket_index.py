@@ -0,0 +1,32 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models import Ticket
+from bot.ticket_index import TicketIndex
+
+
+async def test_ticket_index_rejects_unknown_ids(mock_session: AsyncSession) -> None:
+    """Test that only loaded ticket IDs are known once the index is loaded."""
+    index = TicketIndex(refresh_interval=3600)
+    assert await index.contains(1234567890)  # not loaded yet
+
+    mock_session.add_all([Ticket(id=1234567892), Ticket(id=1234567890)])
+    await mock_session.flush()
+    await index.load()
+
+    assert len(index) == 2
+    assert await index.contains(1234567890)
+    assert await index.contains(1234567892)
+    assert not await index.contains(1234567891)
+    assert not await index.contains(9999999999)
+
+
+async def test_ticket_index_reloads_on_miss(mock_session: AsyncSession) -> None:
+    """Test that a miss reloads an index older than the refresh interval."""
+    index = TicketIndex(refresh_interval=0)
+    await index.load()
+
+    mock_session.add(Ticket(id=1234567890))
+    await mock_session.flush()
+
+    assert await index.contains(1234567890)
+    assert len(index) == 1
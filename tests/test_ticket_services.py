@@ -0,0 +1,99 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot import exceptions
+from bot.models import Member, Ticket
+from bot.services import ticket_services
+from bot.services.ticket_services import claim_ticket
+
+
+@pytest.fixture
+def mock_assign_role(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Mock the role assignment of a successful claim."""
+    assign_role = AsyncMock(return_value=True)
+    monkeypatch.setattr(ticket_services, "assign_role", assign_role)
+    return assign_role
+
+
+async def test_claim_ticket(
+    mock_session: AsyncSession, mock_discord_member: MagicMock, mock_assign_role: AsyncMock
+) -> None:
+    """Test that a member who reacted claims an existing ticket once."""
+    mock_session.add_all([Member(id=mock_discord_member.id, reacted=True), Ticket(id=1234567890)])
+    await mock_session.flush()
+
+    await claim_ticket(mock_discord_member, 1234567890)
+
+    db_member = await Member.get_by_id(mock_discord_member.id, session=mock_session)
+    assert db_member is not None and db_member.ticket_id == 1234567890
+    mock_assign_role.assert_awaited_once()
+
+    with pytest.raises(exceptions.TicketAlreadyClaimedException):
+        await claim_ticket(mock_discord_member, 1234567890)
+    mock_assign_role.assert_awaited_once()
+
+
+async def test_claim_ticket_failures(
+    mock_session: AsyncSession, mock_discord_member: MagicMock, mock_assign_role: AsyncMock
+) -> None:
+    """Test that failed claims report why they failed without assigning the role."""
+    mock_session.add(Ticket(id=1234567890))
+    await mock_session.flush()
+
+    with pytest.raises(exceptions.MemberHasNotReactedToCocException):
+        await claim_ticket(mock_discord_member, 1234567890)
+
+    mock_session.add(Member(id=mock_discord_member.id, reacted=True))
+    await mock_session.flush()
+    with pytest.raises(exceptions.TicketNotFoundInDatabaseException):
+        await claim_ticket(mock_discord_member, 1111111111)
+
+    mock_assign_role.return_value = False
+    with pytest.raises(exceptions.RoleAssignmentFailedException):
+        await claim_ticket(mock_discord_member, 1234567890)
+
+
+async def test_claim_ticket_role_assignment_failed(
+    mock_session: AsyncSession, mock_discord_member: MagicMock, mock_assign_role: AsyncMock
+) -> None:
+    """Test that the claim is released when the role cannot be assigned, so it can be retried."""
+    mock_session.add_all([Member(id=mock_discord_member.id, reacted=True), Ticket(id=1234567890)])
+    await mock_session.flush()
+
+    mock_assign_role.return_value = False
+    with pytest.raises(exceptions.RoleAssignmentFailedException):
+        await claim_ticket(mock_discord_member, 1234567890)
+
+    db_member = await Member.get_state(mock_discord_member.id, session=mock_session)
+    assert db_member is not None and db_member.ticket_id is None
+
+    mock_assign_role.return_value = True
+    await claim_ticket(mock_discord_member, 1234567890)
+    db_member = await Member.get_state(mock_discord_member.id, session=mock_session)
+    assert db_member is not None and db_member.ticket_id == 1234567890
+
+
+async def test_claim_ticket_claimed_by_another_member(
+    mock_session: AsyncSession, mock_discord_member: MagicMock, mock_assign_role: AsyncMock
+) -> None:
+    """Test that the unique index rejects a ticket that another member claimed."""
+    mock_session.add_all(
+        [
+            Member(id=mock_discord_member.id, reacted=True),
+            Member(id=42, reacted=True),
+            Ticket(id=1234567890),
+        ]
+    )
+    await mock_session.flush()
+    await claim_ticket(mock_discord_member, 1234567890)
+
+    db_member = await Member.get_by_id(mock_discord_member.id, session=mock_session)
+    assert db_member is not None and db_member.claimed_at is not None
+
+    other_member = MagicMock(id=42)
+    other_member.name = "other"
+    with pytest.raises(exceptions.TicketClaimedByAnotherMemberException):
+        await claim_ticket(other_member, 1234567890)
+    mock_assign_role.assert_awaited_once()
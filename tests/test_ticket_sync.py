@@ -0,0 +1,48 @@
+import os
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models import Ticket
+from bot.ticket_sync import sync_ticket_export, sync_ticket_exports
+
+
+def write_export(path: Path, content: str, settled: bool = True) -> None:
+    path.write_text(content)
+    if settled:
+        an_hour_ago = time.time() - 3600
+        os.utime(path, (an_hour_ago, an_hour_ago))
+
+
+async def test_sync_ticket_export_reads_only_new_rows(
+    mock_session: AsyncSession, tmp_path: Path
+) -> None:
+    """Test that unchanged files are skipped and appended files only import the new rows."""
+    export = tmp_path / "orders.csv"
+    write_export(export, "order_id\n1234567890\n1234567891\n")
+
+    assert await sync_ticket_export(export) == (2, 0, 0)
+    assert await sync_ticket_export(export) is None
+
+    write_export(export, "order_id\n1234567890\n1234567891\n1234567892\nnope\n")
+    assert await sync_ticket_export(export) == (1, 0, 1)
+    assert await Ticket.get_by_id(1234567892, session=mock_session) is not None
+
+    # A rewritten file is imported again as a whole
+    write_export(export, "order_id\n1234567893\n1234567890\n")
+    assert await sync_ticket_export(export) == (1, 1, 0)
+
+
+async def test_sync_ticket_export_waits_for_incomplete_line(
+    mock_session: AsyncSession, tmp_path: Path
+) -> None:
+    """Test that the last line of a file that is still written is imported once complete."""
+    export = tmp_path / "orders.jsonl"
+    write_export(export, '{"order_id": "1234567890"}\n{"order_id": "12345', settled=False)
+
+    assert await sync_ticket_exports(tmp_path) == (1, 0, 0)
+
+    write_export(export, '{"order_id": "1234567890"}\n{"order_id": "1234567891"}')
+    assert await sync_ticket_exports(tmp_path) == (1, 0, 0)
+    assert await Ticket.get_by_id(1234567891, session=mock_session) is not None
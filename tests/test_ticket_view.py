@@ -0,0 +1,46 @@
+import re
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+from bot.views.ticket_view import ClaimTicketButton, TicketView
+
+
+async def test_ticket_view_encodes_member_id() -> None:
+    """Test that the claim button carries the member ID and the view is not kept around."""
+    view = TicketView(123456789)
+
+    assert view.is_finished()
+    [button] = view.children
+    assert isinstance(button, ClaimTicketButton)
+    assert button.custom_id == "claim_ticket:123456789"
+
+
+async def test_claim_ticket_button_from_custom_id() -> None:
+    """Test that a click is only handled for the member of the thread."""
+    match = re.fullmatch(ClaimTicketButton.__discord_ui_compiled_template__, "claim_ticket:42")
+    assert match is not None
+    button = await ClaimTicketButton.from_custom_id(MagicMock(), MagicMock(), match)
+    assert button.member_id == 42
+
+    interaction = MagicMock(spec=discord.Interaction)
+    interaction.user.id = 42
+    assert await button.interaction_check(interaction)
+
+    interaction.user.id = 43
+    interaction.response.send_message = AsyncMock()
+    assert not await button.interaction_check(interaction)
+    interaction.response.send_message.assert_awaited_once()
+
+
+async def test_claim_ticket_button_from_legacy_custom_id() -> None:
+    """Test that buttons sent with the plain custom ID are handled for the member who clicks."""
+    match = re.fullmatch(ClaimTicketButton.__discord_ui_compiled_template__, "claim_ticket")
+    assert match is not None
+    interaction = MagicMock(spec=discord.Interaction)
+    interaction.user.id = 42
+
+    button = await ClaimTicketButton.from_custom_id(interaction, MagicMock(), match)
+
+    assert button.member_id == 42
+    assert await button.interaction_check(interaction)
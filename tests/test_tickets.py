@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models import Ticket
+from bot.tickets import TicketIdReader, import_tickets
+
+
+def test_ticket_id_reader_formats(tmp_path: Path) -> None:
+    """Test that order IDs are read from CSV, JSON Lines and JSON exports."""
+    csv_file = tmp_path / "orders.csv"
+    csv_file.write_text("order_id,name\n1234567890,a\n 1234567891 ,b\n123,c\n")
+    jsonl_file = tmp_path / "orders.jsonl"
+    jsonl_file.write_text('{"order_id": 1234567890}\n\n{"order_id": "abc"}\n')
+    json_file = tmp_path / "orders.json"
+    json_file.write_text('["1234567890", 1234567891, {"order_id": "1234567892"}]')
+
+    csv_reader = TicketIdReader(csv_file)
+    assert list(csv_reader) == [1234567890, 1234567891]
+    assert csv_reader.invalid == 1
+
+    jsonl_reader = TicketIdReader(jsonl_file)
+    assert list(jsonl_reader) == [1234567890]
+    assert jsonl_reader.invalid == 1
+
+    assert list(TicketIdReader(json_file)) == [1234567890, 1234567891, 1234567892]
+
+    with pytest.raises(ValueError):
+        list(TicketIdReader(csv_file, column="id"))
+
+
+async def test_import_tickets(mock_session: AsyncSession, tmp_path: Path) -> None:
+    """Test that new tickets are inserted and duplicates and invalid IDs are counted."""
+    mock_session.add(Ticket(id=1234567890))
+    await mock_session.flush()
+    export = tmp_path / "orders.csv"
+    export.write_text("order_id\n1234567890\n1234567891\n1234567891\n1234567892\nnope\n")
+
+    assert await import_tickets(export) == (2, 2, 1)
+    assert await Ticket.get_by_id(1234567892, session=mock_session) is not None
@@ -0,0 +1,24 @@
+from typing import AsyncGenerator
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.utility_tasks import AntiSpamTask
+
+
+@pytest.fixture
+async def anti_spam_task(mock_bot: MagicMock) -> AsyncGenerator[AntiSpamTask, None]:
+    """Create an AntiSpamTask whose loops are stopped."""
+    task = AntiSpamTask(mock_bot, expiry_seconds=60, backend="memory")
+    task.cleanup_loop.cancel()
+    task.flush_loop.cancel()
+    yield task
+
+
+async def test_anti_spam_cooldown(anti_spam_task: AntiSpamTask) -> None:
+    """Test that only the recorded message and user are on cooldown."""
+    await anti_spam_task.record_reactor(1, 10)
+
+    assert await anti_spam_task.is_on_cooldown(1, 10)
+    assert not await anti_spam_task.is_on_cooldown(1, 20)
+    assert not await anti_spam_task.is_on_cooldown(2, 10)
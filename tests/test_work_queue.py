@@ -0,0 +1,94 @@
+import asyncio
+
+from bot.work_queue import Job, MemberWorkQueue
+
+
+async def test_work_queue_keeps_member_order() -> None:
+    """Test that the jobs of a member run in order, one at a time."""
+    queue = MemberWorkQueue(workers=2, max_size=10, drain_timeout=1)
+    events: list[tuple[int, int]] = []
+
+    def job(member_id: int, n: int) -> Job:
+        async def run() -> None:
+            events.append((member_id, n))
+            await asyncio.sleep(0)
+            events.append((member_id, n))
+
+        return run
+
+    for n in range(3):
+        await queue.submit(1, job(1, n))
+        await queue.submit(2, job(2, n))
+    await queue.close()
+
+    assert [n for member_id, n in events if member_id == 1] == [0, 0, 1, 1, 2, 2]
+    assert [n for member_id, n in events if member_id == 2] == [0, 0, 1, 1, 2, 2]
+    assert queue.processed == 6
+
+
+async def test_work_queue_backpressure() -> None:
+    """Test that submitting waits while the queue is full and failed jobs are counted."""
+    queue = MemberWorkQueue(workers=1, max_size=1, drain_timeout=1)
+    release = asyncio.Event()
+
+    async def blocked() -> None:
+        await release.wait()
+
+    async def failing() -> None:
+        raise RuntimeError("boom")
+
+    await queue.submit(1, blocked)
+    await asyncio.sleep(0)  # the worker takes the first job
+    await queue.submit(1, failing)
+    assert queue.depth == 1
+
+    waiting = asyncio.create_task(queue.submit(1, failing))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    release.set()
+    await waiting
+    await queue.close()
+    assert queue.processed == 1
+    assert queue.failed == 2
+
+
+async def test_work_queue_slow_member_does_not_block_others() -> None:
+    """Test that a slow job only holds up the jobs of its own member."""
+    queue = MemberWorkQueue(workers=2, max_size=10, drain_timeout=1)
+    release = asyncio.Event()
+    done: list[int] = []
+
+    def job(member_id: int) -> Job:
+        async def run() -> None:
+            if member_id == 1:
+                await release.wait()
+            done.append(member_id)
+
+        return run
+
+    await queue.submit(1, job(1))
+    await queue.submit(1, job(1))
+    await queue.submit(3, job(3))
+    await queue.submit(5, job(5))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert done == [3, 5]
+    release.set()
+    await queue.close()
+    assert done == [3, 5, 1, 1]
+
+
+async def test_work_queue_close_gives_up_after_drain_timeout() -> None:
+    """Test that closing stops the workers when the queued jobs do not finish in time."""
+    queue = MemberWorkQueue(workers=1, max_size=10, drain_timeout=0.01)
+
+    async def hung() -> None:
+        await asyncio.Event().wait()
+
+    await queue.submit(1, hung)
+    await queue.submit(2, hung)
+
+    await asyncio.wait_for(queue.close(), 1)
+    assert queue.processed == 0